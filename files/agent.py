@@ -3,14 +3,19 @@ Hyper-Local Food Trend Agent — Streamlit Dashboard
 Blue & Grey theme | Run: streamlit run app.py
 """
 
+import hashlib
 import json
-import random
+
 import streamlit as st
-import plotly.graph_objects as go
-import plotly.express as px
-from datetime import datetime, timedelta
-from typing import Optional
-import anthropic
+
+# Only light modules load before first paint. Plotly, the Anthropic SDK,
+# requests/bs4 and numpy are imported where first needed: chart helpers,
+# the first LLM call, the scrape and the results view.
+from index import FeedIndex, TermIndex
+from llm import SUGGESTION_CACHE, SuggestionStream
+from pipeline import DEMO_SUGGESTIONS, SCRAPE_CACHE, analyze, generate_report, scrape
+from records import Platform, Post
+from tracing import TRACER, profiled, span
 
 # ─────────────────────────────────────────────────────────────────────────────
 # PAGE CONFIG & CUSTOM CSS
@@ -234,117 +239,42 @@ strong { color: #E8F1FF !important; }
 # DATA LAYER
 # ─────────────────────────────────────────────────────────────────────────────
 
-MOCK_POSTS = [
-    {"platform": "instagram", "text": "Obsessed with this truffle butter pasta at La Nonna! #food #truffle #pasta #foodie", "likes": 1240, "location": "Downtown"},
-    {"platform": "instagram", "text": "Birria tacos are EVERYTHING right now 🔥 #birria #tacos #mexicanfood", "likes": 3400, "location": "Eastside"},
-    {"platform": "instagram", "text": "Korean corn dogs > everything. Change my mind. #koreancorndog #streetfood", "likes": 2100, "location": "Koreatown"},
-    {"platform": "instagram", "text": "Smash burgers with wagyu beef — this weekend's obsession #wagyu #smashburger", "likes": 1870, "location": "Westside"},
-    {"platform": "instagram", "text": "Can't stop thinking about that miso caramel croissant #croissant #fusion #bakery", "likes": 4500, "location": "Northside"},
-    {"platform": "twitter", "text": "birria tacos > all tacos. fight me", "likes": 890, "location": "City Center"},
-    {"platform": "twitter", "text": "every restaurant needs a smash burger option. it's the law.", "likes": 560, "location": "Westside"},
-    {"platform": "twitter", "text": "miso + caramel is the combo i didn't know i needed", "likes": 1200, "location": "Northside"},
-    {"platform": "tiktok", "text": "Making viral Dubai chocolate at home #dubai #chocolate #viral #foodtok", "likes": 45000, "location": "Suburbs"},
-    {"platform": "tiktok", "text": "Birria ramen fusion — the collab nobody asked for but everyone needed 🔥", "likes": 22000, "location": "Eastside"},
-    {"platform": "tiktok", "text": "smash burger tutorial blew up 🍔 #smashburger #burger #foodtok", "likes": 31000, "location": "Westside"},
-    {"platform": "tiktok", "text": "truffle everything is back. truffle fries, truffle pasta, truffle butter #truffle", "likes": 18000, "location": "Downtown"},
-    {"platform": "yelp", "text": "The wagyu smash burger was incredible. Worth every penny.", "likes": 45, "location": "Westside"},
-    {"platform": "yelp", "text": "Birria tacos — crispy, cheesy, and the consommé was perfect for dipping.", "likes": 67, "location": "Eastside"},
-    {"platform": "yelp", "text": "Dubai chocolate dessert — unique and absolutely delicious.", "likes": 89, "location": "Suburbs"},
-]
-
-PLATFORM_EMOJI = {"instagram": "📸", "tiktok": "🎵", "twitter": "🐦", "yelp": "⭐"}
-
-def scrape_local_trends(location: Optional[str] = None) -> list[dict]:
-    posts = MOCK_POSTS.copy()
-    if location and location != "All":
-        posts = [p for p in posts if location.lower() in p["location"].lower()] or posts
-    for post in posts:
-        post["likes"] = post["likes"] + random.randint(-200, 600)
-        post["scraped_at"] = datetime.now().isoformat()
-    return posts
-
-def analyze_trends(posts: list[dict]) -> dict:
-    keywords = {}
-    food_terms = [
-        "birria", "truffle", "wagyu", "smash burger", "miso", "caramel",
-        "croissant", "tacos", "ramen", "korean corn dog", "dubai chocolate",
-        "pasta", "burger", "chocolate", "fusion"
-    ]
-    for post in posts:
-        text = post["text"].lower()
-        for term in food_terms:
-            if term in text:
-                keywords[term] = keywords.get(term, 0) + post["likes"]
-    sorted_trends = sorted(keywords.items(), key=lambda x: x[1], reverse=True)
-    saturday = datetime.now() + timedelta(days=(5 - datetime.now().weekday()) % 7 or 7)
-    return {
-        "top_ingredients": [k for k, _ in sorted_trends[:5]],
-        "all_scores": dict(sorted_trends),
-        "total_posts_analyzed": len(posts),
-        "analysis_date": datetime.now().strftime("%Y-%m-%d"),
-        "weekend": saturday.strftime("%B %d"),
-    }
-
-def suggest_dishes(trends: dict, restaurant_type: str, api_key: str) -> dict:
-    client = anthropic.Anthropic(api_key=api_key)
-    prompt = f"""You are a creative restaurant consultant designing weekend specials.
-
-Local social media food trends:
-- Top trending: {', '.join(trends['top_ingredients'])}
-- Engagement scores: {json.dumps(trends['all_scores'], indent=2)}
-- Weekend: {trends['weekend']}
-- Restaurant type: {restaurant_type}
-
-Generate 4 creative weekend special dishes. Return ONLY valid JSON:
-{{
-  "dishes": [
-    {{
-      "name": "Dish Name",
-      "description": "Brief appetizing description (2 sentences)",
-      "trending_element": "trend it capitalizes on",
-      "price_range": "$XX-$XX",
-      "social_hook": "Short Instagram caption"
-    }}
-  ],
-  "marketing_headline": "Punchy weekend specials headline",
-  "key_insight": "One sentence on why these trends matter right now"
-}}"""
-    msg = client.messages.create(
-        model="claude-opus-4-6",
-        max_tokens=1024,
-        messages=[{"role": "user", "content": prompt}]
-    )
-    raw = msg.content[0].text.strip()
-    if raw.startswith("```"):
-        raw = raw.split("```")[1]
-        if raw.startswith("json"):
-            raw = raw[4:]
-    return json.loads(raw.strip())
-
-def generate_report(trends: dict, suggestions: dict) -> str:
-    lines = [
-        f"# 🍽️ Weekly Food Trend Report — {trends['analysis_date']}",
-        f"\n**Weekend Focus:** {trends['weekend']} · **Posts Analyzed:** {trends['total_posts_analyzed']}",
-        "\n---\n",
-        "## 📈 Top Trending Items\n",
-    ]
-    for item, score in list(trends["all_scores"].items())[:5]:
-        lines.append(f"- **{item.title()}** — {score:,} engagement points")
-    lines += [
-        "\n---\n",
-        "## 🍴 Weekend Specials\n",
-        f"> {suggestions['marketing_headline']}\n",
-    ]
-    for i, d in enumerate(suggestions["dishes"], 1):
-        lines += [
-            f"### {i}. {d['name']} ({d['price_range']})",
-            f"{d['description']}",
-            f"- 🔥 Trend: *{d['trending_element']}*",
-            f"- 📸 Hook: *\"{d['social_hook']}\"*\n",
-        ]
-    lines += ["---\n", f"## 💡 Key Insight\n\n{suggestions['key_insight']}",
-              "\n\n*Generated by Hyper-Local Food Trend Agent · Powered by Claude*"]
-    return "\n".join(lines)
+# Read for trend history and discovery; SCRAPE_CACHE appends every scrape to
+# the same FOOD_AGENT_ARCHIVE_DIR archive.
+@st.cache_resource(show_spinner=False)
+def get_archive():
+    from archive import archive_from_env
+    return archive_from_env()
+
+FEED_PAGE_SIZE = 25
+
+PLATFORM_EMOJI = {Platform.INSTAGRAM: "📸", Platform.TIKTOK: "🎵", Platform.TWITTER: "🐦", Platform.YELP: "⭐"}
+
+def render_post_card(post: Post) -> str:
+    emoji = PLATFORM_EMOJI.get(post.platform, "📱")
+    return f"""
+    <div class="post-item">
+      <div style="font-size:1.3rem;flex-shrink:0">{emoji}</div>
+      <div>
+        <div class="post-text">{post.text}</div>
+        <div class="post-sub">❤ {post.likes:,} · {post.location or '—'} · {post.platform.title()}</div>
+      </div>
+    </div>
+    """
+
+def render_dish_card(i: int, dish: dict) -> str:
+    return f"""
+    <div class="dish-card">
+      <div class="dish-name">#{i} {dish['name']}</div>
+      <div class="dish-desc">{dish['description']}</div>
+      <div class="dish-meta">
+        <span class="tag tag-trend">🔥 {dish['trending_element']}</span>
+        <span class="tag tag-price">{dish['price_range']}</span>
+      </div>
+      <div class="dish-hook">📸 "{dish['social_hook']}"</div>
+    </div>
+    """
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 # PLOTLY CHART HELPERS (dark blue/grey theme)
@@ -363,6 +293,7 @@ def make_bar_chart(all_scores: dict):
     names = [k.title() for k, _ in items]
     values = [v for _, v in items]
     colors = [f"rgba(41,121,255,{0.9 - i*0.08})" for i in range(len(names))]
+    import plotly.graph_objects as go
     fig = go.Figure(go.Bar(
         x=values, y=names, orientation="h",
         marker=dict(color=colors, line=dict(width=0)),
@@ -382,6 +313,7 @@ def make_donut_chart(all_scores: dict):
     labels = [k.title() for k, _ in items]
     values = [v for _, v in items]
     palette = ["#2979FF", "#00B4D8", "#5B9BF8", "#1E4D8C", "#4A5568"]
+    import plotly.graph_objects as go
     fig = go.Figure(go.Pie(
         labels=labels, values=values,
         hole=0.55,
@@ -402,13 +334,11 @@ def make_donut_chart(all_scores: dict):
     )
     return fig
 
-def make_platform_chart(posts: list[dict]):
-    platform_likes = {}
-    for p in posts:
-        platform_likes[p["platform"]] = platform_likes.get(p["platform"], 0) + p["likes"]
+def make_platform_chart(platform_likes: dict):
     platforms = list(platform_likes.keys())
     values = list(platform_likes.values())
     palette = ["#2979FF", "#00B4D8", "#5B9BF8", "#1A2E44"]
+    import plotly.graph_objects as go
     fig = go.Figure(go.Bar(
         x=platforms, y=values,
         marker=dict(color=palette[:len(platforms)], line=dict(width=0)),
@@ -423,10 +353,48 @@ def make_platform_chart(posts: list[dict]):
     )
     return fig
 
+# ─────────────────────────────────────────────────────────────────────────────
+# RENDER CACHE — figures and HTML blocks keyed on a content hash of the results
+# ─────────────────────────────────────────────────────────────────────────────
+
+def results_key(trends: dict, suggestions: dict, posts: list) -> str:
+    payload = json.dumps([trends, suggestions, posts], sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+# Underscored arguments are not hashed; `key` already identifies their content.
+@st.cache_resource(max_entries=16, show_spinner=False)
+def trend_figures(key: str, _all_scores: dict, _platform_likes: dict):
+    return make_bar_chart(_all_scores), make_donut_chart(_all_scores), make_platform_chart(_platform_likes)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def dishes_html(key: str, _dishes: list) -> str:
+    return "".join(render_dish_card(i, dish) for i, dish in enumerate(_dishes, 1))
+
 # ─────────────────────────────────────────────────────────────────────────────
 # SIDEBAR
 # ─────────────────────────────────────────────────────────────────────────────
 
+def render_cache_panel():
+    with cache_panel:
+        cache_stats = SUGGESTION_CACHE.stats()
+        st.caption(f"Suggestion cache: {cache_stats['hits']} hits · {cache_stats['misses']} misses · {cache_stats['entries']} stored")
+
+        # Process-wide, so this shows every session's scrapes, not just this one's.
+        with st.expander("🛠 Admin · Scrape cache"):
+            scrape_stats = SCRAPE_CACHE.stats()
+            c1, c2 = st.columns(2)
+            c1.metric("Hit rate", f"{scrape_stats['hit_rate']:.0%}")
+            c2.metric("Requests", f"{scrape_stats['requests']:,}")
+            st.caption(f"{scrape_stats['hit']} fresh · {scrape_stats['stale']} stale · {scrape_stats['coalesced']} coalesced · "
+                       f"{scrape_stats['miss']} fetched · {scrape_stats['refreshes']} background refreshes")
+            if scrape_stats["last_error"]:
+                st.caption(f"⚠ {scrape_stats['refresh_errors']} failed refreshes · last: {scrape_stats['last_error']}")
+            if scrape_rows := SCRAPE_CACHE.entries():
+                st.dataframe(scrape_rows, use_container_width=True, hide_index=True)
+            st.caption(f"Fresh for {SCRAPE_CACHE.ttl:.0f}s, then served stale for up to {SCRAPE_CACHE.stale:.0f}s while refreshing.")
+            if st.button("Clear scrape cache", key="clear_scrape_cache", use_container_width=True):
+                SCRAPE_CACHE.clear()
+
 with st.sidebar:
     st.markdown("### 🍽️ Food Trend Agent")
     st.markdown('<p style="font-size:0.75rem;color:#4A5568;margin-top:-0.5rem;">Hyper-Local · #34 · Food Industry</p>', unsafe_allow_html=True)
@@ -446,6 +414,9 @@ with st.sidebar:
 
     run_btn = st.button("✦ Run Agent", type="primary", use_container_width=True)
     demo_btn = st.button("⚡ Quick Demo (no API key)", type="secondary", use_container_width=True)
+    profile_run = st.checkbox("⏱ Profile runs (cProfile)", key="profile_run")
+    # Filled after the run logic, so the counts include this rerun's run.
+    cache_panel = st.container()
 
     st.divider()
     st.markdown("""
@@ -462,21 +433,6 @@ with st.sidebar:
     </div>
     """, unsafe_allow_html=True)
 
-# ─────────────────────────────────────────────────────────────────────────────
-# DEMO DATA
-# ─────────────────────────────────────────────────────────────────────────────
-
-DEMO_SUGGESTIONS = {
-    "marketing_headline": "This Weekend: Trending Tastes, Locally Inspired",
-    "key_insight": "Birria and smash burger culture are dominating local TikTok feeds, signaling demand for bold, shareable comfort food that photographs beautifully.",
-    "dishes": [
-        {"name": "Birria Wagyu Smash", "description": "Wagyu smash patty dipped in rich birria consommé, melted Oaxacan cheese, and crispy confit onions on a brioche bun. A crossover hit waiting to happen.", "trending_element": "birria + smash burger", "price_range": "$18–$22", "social_hook": "The smash burger got a birria glow-up 🌶️🔥"},
-        {"name": "Truffle Miso Croissant Toast", "description": "Buttery croissant toasted flat, spread with white miso caramel butter and finished with shaved black truffle and sea salt. Brunch redefined.", "trending_element": "truffle + miso caramel", "price_range": "$14–$16", "social_hook": "Brunch just evolved. Trust us ✨"},
-        {"name": "Dubai Chocolate Smash Tacos", "description": "Crispy smash-style street tacos filled with pistachio-studded Dubai chocolate ganache and pickled chilies. Sweet heat in every bite.", "trending_element": "dubai chocolate + tacos", "price_range": "$16–$20", "social_hook": "Dubai chocolate met birria tacos and we're never going back 🍫🌮"},
-        {"name": "Truffle Corn Dog Bites", "description": "Mini Korean-style corn dogs with a mozzarella core, served with truffle aioli and spiced honey. Shareworthy by design.", "trending_element": "korean corn dog + truffle", "price_range": "$12–$15", "social_hook": "Korean corn dogs got a luxury upgrade 🌭✨"},
-    ]
-}
-
 # ─────────────────────────────────────────────────────────────────────────────
 # HEADER
 # ─────────────────────────────────────────────────────────────────────────────
@@ -499,38 +455,66 @@ if run_btn:
     if not api_key:
         st.error("Please enter your Anthropic API key in the sidebar.")
     else:
-        with st.spinner("🔍 Scraping social media posts…"):
-            posts = scrape_local_trends(location)
-        with st.spinner("📊 Analyzing food trends…"):
-            trends = analyze_trends(posts)
-        with st.spinner("🤖 Consulting Claude for dish suggestions…"):
-            try:
-                suggestions = suggest_dishes(trends, restaurant_type, api_key)
-            except Exception as e:
-                st.error(f"API error: {e}")
-                st.stop()
-        with st.spinner("📝 Generating report…"):
-            report = generate_report(trends, suggestions)
-        st.session_state.results = {"trends": trends, "suggestions": suggestions, "report": report, "posts": posts}
+        with span("run", location=location, restaurant_type=restaurant_type) as run_span, \
+                profiled(profile_run) as profile:
+            with st.spinner("🔍 Scraping social media posts…"):
+                posts = scrape(location)
+            with st.spinner("📊 Analyzing food trends…"):
+                index = TermIndex()
+                trends = analyze(posts, location, get_archive(), index)
+            # Dish cards render as each object closes in the streamed reply.
+            preview = st.empty()
+            with st.spinner("🤖 Consulting Claude for dish suggestions…"):
+                try:
+                    stream = SuggestionStream(trends, restaurant_type, api_key)
+                    cards = []
+                    for i, dish in enumerate(stream, 1):
+                        cards.append(render_dish_card(i, dish))
+                        preview.markdown("".join(cards), unsafe_allow_html=True)
+                    suggestions = stream.suggestions
+                except Exception as e:
+                    st.error(f"API error: {e}")
+                    render_cache_panel()
+                    st.stop()
+            preview.empty()
+            with st.spinner("📝 Generating report…"):
+                report = generate_report(trends, suggestions)
+            st.session_state.results = {"trends": trends, "suggestions": suggestions, "report": report, "posts": posts, "index": index,
+                                        "key": results_key(trends, suggestions, posts), "feed": FeedIndex(posts),
+                                        "trace": run_span, "profile": profile}
         st.success("✅ Agent run complete!")
 
 if demo_btn:
-    with st.spinner("⚡ Loading demo data…"):
-        posts = scrape_local_trends(location)
-        trends = analyze_trends(posts)
-        report = generate_report(trends, DEMO_SUGGESTIONS)
-        st.session_state.results = {"trends": trends, "suggestions": DEMO_SUGGESTIONS, "report": report, "posts": posts}
+    with span("run", location=location, demo=True) as run_span, profiled(profile_run) as profile:
+        with st.spinner("⚡ Loading demo data…"):
+            posts = scrape(location)
+            index = TermIndex()
+            trends = analyze(posts, location, get_archive(), index)
+            report = generate_report(trends, DEMO_SUGGESTIONS)
+            st.session_state.results = {"trends": trends, "suggestions": DEMO_SUGGESTIONS, "report": report, "posts": posts, "index": index,
+                                        "key": results_key(trends, DEMO_SUGGESTIONS, posts), "feed": FeedIndex(posts),
+                                        "trace": run_span, "profile": profile}
     st.success("Demo data loaded — run with a real API key to get live Claude suggestions!")
 
+render_cache_panel()
+
 # ─────────────────────────────────────────────────────────────────────────────
 # RESULTS
 # ─────────────────────────────────────────────────────────────────────────────
 
 if st.session_state.results:
+    from store import aggregate_posts
+
     R = st.session_state.results
     trends = R["trends"]
     suggestions = R["suggestions"]
     posts = R["posts"]
+    agg = aggregate_posts(posts)
+    if "key" not in R:
+        R["key"] = results_key(trends, suggestions, posts)
+    bar_fig, donut_fig, platform_fig = trend_figures(R["key"], trends["all_scores"], agg.platform)
+    if "feed" not in R:
+        R["feed"] = FeedIndex(posts)
 
     # ── Metrics ──
     col1, col2, col3, col4 = st.columns(4)
@@ -555,11 +539,11 @@ if st.session_state.results:
     with tab1:
         c1, c2 = st.columns([3, 2])
         with c1:
-            st.plotly_chart(make_bar_chart(trends["all_scores"]), use_container_width=True)
+            st.plotly_chart(bar_fig, use_container_width=True)
         with c2:
-            st.plotly_chart(make_donut_chart(trends["all_scores"]), use_container_width=True)
+            st.plotly_chart(donut_fig, use_container_width=True)
 
-        st.plotly_chart(make_platform_chart(posts), use_container_width=True)
+        st.plotly_chart(platform_fig, use_container_width=True)
 
         st.markdown("**Top 5 Trending Items**")
         for i, (item, score) in enumerate(list(trends["all_scores"].items())[:5], 1):
@@ -567,34 +551,56 @@ if st.session_state.results:
             st.markdown(f"`#{i}` **{item.title()}** — {score:,} pts")
             st.progress(pct / 100)
 
+        if trends.get("rising"):
+            st.markdown(f"**🚀 About to break for {trends['weekend']}:** "
+                        + " · ".join(term.title() for term in trends["rising"]))
+
+        new_terms = [d for d in trends.get("discovered", []) if not d["known"]]
+        if new_terms:
+            st.markdown("**🔎 New from hashtags & phrases:** " + " · ".join(
+                f"{d['term'].title()} ({d['posts']} posts" + (f", {d['lift']:.1f}× lift)" if d["lift"] else ")")
+                for d in new_terms))
+
+        index = R.get("index")
+        if index is not None and trends["all_scores"]:
+            st.markdown("**Drill-down: posts behind a trend**")
+            d1, d2, d3 = st.columns(3)
+            term = d1.selectbox("Trend", list(trends["all_scores"]), key="drill_term")
+            drill_loc = d2.selectbox("Location", ["All"] + list(agg.location), key="drill_location")
+            drill_platform = d3.selectbox("Platform", ["All"] + list(agg.platform), key="drill_platform")
+            top = index.top_posts(term, 5,
+                                  location=None if drill_loc == "All" else drill_loc,
+                                  platform=None if drill_platform == "All" else drill_platform)
+            if not top:
+                st.caption("No posts match this filter.")
+            for post_id, _ in top:
+                st.markdown(render_post_card(index.posts[post_id]), unsafe_allow_html=True)
+
     with tab2:
         st.markdown(f'<p style="color:#5B9BF8;font-style:italic;margin-bottom:1.25rem">"{suggestions["marketing_headline"]}"</p>', unsafe_allow_html=True)
-        for i, dish in enumerate(suggestions["dishes"], 1):
-            st.markdown(f"""
-            <div class="dish-card">
-              <div class="dish-name">#{i} {dish['name']}</div>
-              <div class="dish-desc">{dish['description']}</div>
-              <div class="dish-meta">
-                <span class="tag tag-trend">🔥 {dish['trending_element']}</span>
-                <span class="tag tag-price">{dish['price_range']}</span>
-              </div>
-              <div class="dish-hook">📸 "{dish['social_hook']}"</div>
-            </div>
-            """, unsafe_allow_html=True)
+        st.markdown(dishes_html(R["key"], suggestions["dishes"]), unsafe_allow_html=True)
 
     with tab3:
-        st.markdown(f"**{len(posts)} posts scraped** · Location: {location}")
-        for post in posts:
-            emoji = PLATFORM_EMOJI.get(post["platform"], "📱")
-            st.markdown(f"""
-            <div class="post-item">
-              <div style="font-size:1.3rem;flex-shrink:0">{emoji}</div>
-              <div>
-                <div class="post-text">{post['text']}</div>
-                <div class="post-sub">❤ {post['likes']:,} · {post.get('location','—')} · {post['platform'].title()}</div>
-              </div>
-            </div>
-            """, unsafe_allow_html=True)
+        st.markdown(f"**{agg.posts:,} posts scraped** · Location: {location}")
+        for col, (platform, likes) in zip(st.columns(len(agg.platform) or 1), agg.platform.items()):
+            col.metric(f"{PLATFORM_EMOJI.get(platform, '📱')} {platform.title()}", f"{likes:,}", "likes", delta_color="off")
+        f1, f2, f3 = st.columns([2, 1, 1])
+        query = f1.text_input("Search posts", placeholder="whole words, e.g. birria tacos", key="feed_query")
+        feed_platform = f2.selectbox("Platform", ["All"] + list(agg.platform), key="feed_platform")
+        feed_loc = f3.selectbox("Location", ["All"] + list(agg.location), key="feed_location")
+        feed = R["feed"]
+        matches = feed.query(query, None if feed_platform == "All" else feed_platform,
+                             None if feed_loc == "All" else feed_loc)
+        pages = max(1, -(-len(matches) // FEED_PAGE_SIZE))
+        if st.session_state.get("feed_page", 1) > pages:
+            st.session_state.feed_page = pages
+        page = st.number_input("Page", min_value=1, max_value=pages, step=1, key="feed_page")
+        start = (page - 1) * FEED_PAGE_SIZE
+        st.caption(f"{len(matches):,} matching posts · page {page} of {pages}")
+        if not matches:
+            st.caption("No posts match this search.")
+        st.markdown("".join(render_post_card(feed.posts[i]) for i in matches[start:start + FEED_PAGE_SIZE]),
+                    unsafe_allow_html=True)
 
     with tab4:
         st.download_button(
@@ -605,6 +611,15 @@ if st.session_state.results:
         )
         st.markdown(R["report"])
 
+    if R.get("trace") is not None:
+        with st.expander(f"⏱ Run trace · {R['trace'].duration * 1000:,.0f} ms"):
+            st.dataframe(
+                [{"stage": s.name, "ms": round(s.duration * 1000, 1), **s.attrs} for s in TRACER.trace(R["trace"].trace_id)],
+                use_container_width=True, hide_index=True,
+            )
+            if R["profile"].get("summary"):
+                st.code(R["profile"]["summary"], language="text")
+
 else:
     # Welcome state
     st.markdown("""
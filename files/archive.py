@@ -0,0 +1,175 @@
+"""
+Hyper-Local Food Trend Agent — Post Archive
+Append-only columnar segments on disk | memory-mapped, range-pruned scans
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Union
+
+import numpy as np
+
+from records import Post, as_location, as_platform
+from store import PostStore
+
+Timestamp = Union[datetime, float, int, None]
+
+
+def _epoch(ts: Timestamp) -> Optional[int]:
+    if ts is None:
+        return None
+    return int(ts.timestamp()) if isinstance(ts, datetime) else int(ts)
+
+
+def _blob(path: str) -> np.ndarray:
+    # np.memmap refuses empty files.
+    return np.memmap(path, dtype=np.uint8, mode="r") if os.path.getsize(path) else np.zeros(0, dtype=np.uint8)
+
+
+def _write_strings(root: str, name: str, values: list[str]) -> None:
+    encoded = [v.encode() for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    np.save(os.path.join(root, f"{name}_offsets.npy"), offsets)
+    with open(os.path.join(root, f"{name}.bin"), "wb") as f:
+        f.writelines(encoded)
+
+
+class Segment:
+    """One immutable archive segment; columns are memory-mapped on first use.
+
+    Layout: one .npy file per column (platform/location codes, likes,
+    scraped_at epoch seconds), text.bin and id.bin holding UTF-8 post text
+    and post ids back to back with text_offsets.npy and id_offsets.npy, and
+    meta.json with the row count, time range and the platform/location
+    dictionaries. An empty id reads back as None, as does the "—" location
+    PostStore files posts without one under. Segments written before ids
+    were archived have no id files and read back with id=None.
+    """
+
+    COLUMNS = ("platform", "location", "likes", "scraped_at", "text_offsets")
+    STRINGS = ("text", "id")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self._cols: Optional[dict] = None
+
+    def __len__(self) -> int:
+        return self.meta["count"]
+
+    @property
+    def written(self) -> float:
+        """Epoch seconds the segment was appended, from its name."""
+        return int(self.name.split("-")[1]) / 1e9
+
+    @property
+    def cols(self) -> dict:
+        if self._cols is None:
+            cols = {name: np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r") for name in self.COLUMNS}
+            cols["text"] = _blob(os.path.join(self.path, "text.bin"))
+            if os.path.exists(os.path.join(self.path, "id.bin")):
+                cols["id_offsets"] = np.load(os.path.join(self.path, "id_offsets.npy"), mmap_mode="r")
+                cols["id"] = _blob(os.path.join(self.path, "id.bin"))
+            self._cols = cols
+        return self._cols
+
+    def overlaps(self, start: Optional[int], end: Optional[int], locations: Optional[set]) -> bool:
+        if start is not None and self.meta["max_ts"] < start:
+            return False
+        if end is not None and self.meta["min_ts"] >= end:
+            return False
+        return locations is None or not locations.isdisjoint(self.meta["locations"])
+
+    def select(self, start: Optional[int] = None, end: Optional[int] = None,
+               locations: Optional[set] = None) -> np.ndarray:
+        cols = self.cols
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= cols["scraped_at"] >= start
+        if end is not None:
+            mask &= cols["scraped_at"] < end
+        if locations is not None:
+            codes = [i for i, loc in enumerate(self.meta["locations"]) if loc in locations]
+            mask &= np.isin(cols["location"], codes)
+        return np.flatnonzero(mask)
+
+    def _string(self, name: str, row: int) -> Optional[str]:
+        cols = self.cols
+        if name not in cols:
+            return None
+        lo, hi = cols[f"{name}_offsets"][row], cols[f"{name}_offsets"][row + 1]
+        return bytes(cols[name][lo:hi]).decode()
+
+    def post(self, row: int) -> Post:
+        cols = self.cols
+        location = self.meta["locations"][cols["location"][row]]
+        return Post(as_platform(self.meta["platforms"][cols["platform"][row]]), self._string("text", row),
+                    int(cols["likes"][row]), as_location(location) if location != "—" else None,
+                    int(cols["scraped_at"][row]), self._string("id", row) or None)
+
+
+class PostArchive:
+    """Directory of append-only segments; each `append` writes one new segment."""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._segments: dict[str, Segment] = {}
+
+    def append(self, posts: Iterable[Post]) -> Optional[str]:
+        posts = list(posts)
+        store = PostStore.from_posts(posts)
+        if not len(store):
+            return None
+        cols = store.columns
+
+        # Sortable by creation time; written under a temp name and renamed so
+        # readers never see a half-written segment.
+        name = f"seg-{time.time_ns():020d}-{os.getpid()}"
+        tmp = os.path.join(self.root, f".{name}.tmp")
+        os.makedirs(tmp)
+        for col in ("platform", "location", "likes", "scraped_at"):
+            np.save(os.path.join(tmp, f"{col}.npy"), cols[col])
+        _write_strings(tmp, "text", store.texts)
+        _write_strings(tmp, "id", [post.id or "" for post in posts])
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump({
+                "count": len(store),
+                "min_ts": int(cols["scraped_at"].min()),
+                "max_ts": int(cols["scraped_at"].max()),
+                "platforms": store.platforms,
+                "locations": store.locations,
+            }, f)
+        os.rename(tmp, os.path.join(self.root, name))
+        return name
+
+    def segments(self) -> list[Segment]:
+        names = sorted(n for n in os.listdir(self.root) if n.startswith("seg-"))
+        for name in names:
+            if name not in self._segments:
+                self._segments[name] = Segment(os.path.join(self.root, name))
+        return [self._segments[name] for name in names]
+
+    def __len__(self) -> int:
+        return sum(len(seg) for seg in self.segments())
+
+    def scan(self, start: Timestamp = None, end: Timestamp = None,
+             locations: Optional[Iterable[str]] = None) -> Iterator[Post]:
+        """Posts with start <= ts < end in the given locations, oldest segment first."""
+        start, end = _epoch(start), _epoch(end)
+        wanted = set(locations) if locations is not None else None
+        for seg in self.segments():
+            if not seg.overlaps(start, end, wanted):
+                continue
+            for row in seg.select(start, end, wanted):
+                yield seg.post(int(row))
+
+
+def archive_from_env() -> Optional[PostArchive]:
+    root = os.environ.get("FOOD_AGENT_ARCHIVE_DIR")
+    return PostArchive(root) if root else None
@@ -0,0 +1,925 @@
+"""
+Hyper-Local Food Trend Agent — Benchmarks
+Run: python bench.py <benchmark> [options]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, NamedTuple, Optional
+from urllib.parse import unquote
+
+import anthropic
+import numpy as np
+
+from archive import PostArchive
+from discovery import TermDiscovery
+from index import FeedIndex, TermIndex
+from llm import MODEL, SuggestionStream, get_client
+from matcher import SCAN_CROSSOVER, TermMatcher
+from pipeline import DEMO_SUGGESTIONS, ScrapeCache, generate_report
+from records import Post
+from scraper import ADAPTERS, ScrapeEngine
+from shard import analyze_trends_sharded, partition
+from sketch import HeavyHitters
+from store import PostStore, aggregate
+from synthetic import SyntheticCorpus
+from trends import FOOD_TERMS, IncrementalAnalyzer, TrendAccumulator, analyze_trends, post_id
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SYNTHETIC DATA
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Every benchmark draws from synthetic.SyntheticCorpus; the fixed `end`
+# keeps their posts identical from run to run.
+BENCH_END = 1_700_000_000
+
+def corpus(seed: int = 0, terms: int = 500, locations: int = 40, end: Optional[float] = BENCH_END,
+           **kwargs) -> SyntheticCorpus:
+    return SyntheticCorpus(seed, terms, locations=[f"Neighborhood {i}" for i in range(locations)], end=end, **kwargs)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# FAKE PLATFORM SERVER
+# ─────────────────────────────────────────────────────────────────────────────
+
+_FEED_TEMPLATES = {
+    "instagram": '<article data-shortcode="{id}" data-location="{loc}"><p class="caption">{text}</p><span class="likes">{likes} likes</span></article>',
+    "tiktok": '<div class="video-card" data-video-id="{id}" data-location="{loc}"><p class="desc">{text}</p><b class="like-count">{likes}</b></div>',
+    "twitter": '<article class="tweet" data-tweet-id="{id}" data-location="{loc}"><div class="tweet-text">{text}</div><span class="like-count">{likes}</span></article>',
+    "yelp": '<li class="review" data-review-id="{id}" data-location="{loc}"><p class="comment">{text}</p><span class="useful-count">{likes}</span></li>',
+}
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        _, platform, location = self.path.split("/", 2)
+        location = unquote(location)
+        with self.server.lock:
+            self.server.requests[platform] = self.server.requests.get(platform, 0) + 1
+            failures = self.server.fail.get(platform)
+            status = failures.pop(0) if failures else 200
+        time.sleep(self.server.latency)
+        if status != 200:
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        rng = random.Random(self.path)
+        template = _FEED_TEMPLATES[platform]
+        items = "".join(
+            template.format(id=f"{location}-{i}", loc=location, text=f"post {i} about {rng.choice(self.server.terms)}",
+                            likes=f"{rng.randint(1, 999)}.{rng.randint(0, 9)}K")
+            for i in range(self.server.page_size)
+        )
+        body = f"<html><body>{items}</body></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def fake_feed_server(latency: float, page_size: int, terms: list[str], fail: Optional[dict[str, list[int]]] = None):
+    """Local feed server for the platform adapters; `server.requests` counts requests per platform.
+
+    `fail` maps a platform to the statuses its next requests answer with,
+    in order, before it serves its feed again.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+    server.daemon_threads = True
+    server.latency, server.page_size, server.terms = latency, page_size, terms
+    server.fail = {platform: list(statuses) for platform, statuses in (fail or {}).items()}
+    server.requests, server.lock = {}, threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+# ─────────────────────────────────────────────────────────────────────────────
+# STUB MESSAGES API
+# ─────────────────────────────────────────────────────────────────────────────
+
+STUB_SUGGESTIONS = {
+    "dishes": [{"name": f"Stub Dish {i}", "description": "A stub dish. Served hot.", "trending_element": "birria",
+                "price_range": "$10-$12", "social_hook": "stub"} for i in range(1, 5)],
+    "marketing_headline": "Stub headline",
+    "key_insight": "Stub insight.",
+}
+
+class _MessagesHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        text = json.dumps(STUB_SUGGESTIONS, indent=2)
+        usage = {"input_tokens": 400, "output_tokens": 300}
+        if request.get("stream"):
+            return self._stream(text, usage)
+        time.sleep(self.server.latency)
+        body = json.dumps({
+            "id": "msg_stub", "type": "message", "role": "assistant", "model": MODEL,
+            "content": [{"type": "text", "text": text}],
+            "stop_reason": "end_turn", "stop_sequence": None, "usage": usage,
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _event(self, name: str, data: dict):
+        payload = f"event: {name}\ndata: {json.dumps(data)}\n\n".encode()
+        self.wfile.write(f"{len(payload):x}\r\n".encode() + payload + b"\r\n")
+        self.wfile.flush()
+
+    def _stream(self, text: str, usage: dict):
+        # `latency` is spread evenly over the deltas to mimic token generation.
+        chunks = [text[i:i + 16] for i in range(0, len(text), 16)]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self._event("message_start", {"type": "message_start", "message": {
+            "id": "msg_stub", "type": "message", "role": "assistant", "model": MODEL, "content": [],
+            "stop_reason": None, "stop_sequence": None, "usage": {**usage, "output_tokens": 0}}})
+        self._event("content_block_start", {"type": "content_block_start", "index": 0,
+                                            "content_block": {"type": "text", "text": ""}})
+        for chunk in chunks:
+            time.sleep(self.server.latency / len(chunks))
+            self._event("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                                "delta": {"type": "text_delta", "text": chunk}})
+        self._event("content_block_stop", {"type": "content_block_stop", "index": 0})
+        self._event("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                      "usage": {"output_tokens": usage["output_tokens"]}})
+        self._event("message_stop", {"type": "message_stop"})
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+def stub_messages_server(latency: float = 0.0):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _MessagesHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+# ─────────────────────────────────────────────────────────────────────────────
+# BENCHMARKS
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _naive_scores(posts, terms) -> dict:
+    keywords = {}
+    for post in posts:
+        text = post.text.lower()
+        for term in terms:
+            if term in text:
+                keywords[term] = keywords.get(term, 0) + post.likes
+    return keywords
+
+def _matcher_scores(posts, matcher: TermMatcher) -> dict:
+    keywords = {}
+    for post in posts:
+        for term in matcher.find(post.text.lower()):
+            keywords[term] = keywords.get(term, 0) + post.likes
+    return keywords
+
+def bench_matcher(args):
+    posts = corpus(0, args.terms)
+    terms = posts.terms
+    t0 = time.perf_counter()
+    matcher = TermMatcher(terms)
+    build = time.perf_counter() - t0
+
+    sample = list(posts.posts(min(args.naive_sample, args.posts)))
+    t0 = time.perf_counter()
+    expected = _naive_scores(sample, terms)
+    naive_rate = len(sample) / (time.perf_counter() - t0)
+    if _matcher_scores(sample, matcher) != expected:
+        raise SystemExit("matcher scores diverge from `term in text` baseline")
+
+    t0 = time.perf_counter()
+    _matcher_scores(posts.posts(args.posts), matcher)
+    elapsed = time.perf_counter() - t0
+
+    print(f"terms={len(terms):,} posts={args.posts:,}")
+    print(f"  build automaton      {build:8.2f} s")
+    print(f"  matcher              {elapsed:8.2f} s  ({args.posts / elapsed:,.0f} posts/s)")
+    print(f"  naive (extrapolated) {args.posts / naive_rate:8.2f} s  ({naive_rate:,.0f} posts/s)")
+    print(f"  speedup              {args.posts / naive_rate / elapsed:8.1f}x")
+
+    # Where the automaton starts paying off, on FOOD_TERMS topped up with invented dishes.
+    print(f"crossover (SCAN_CROSSOVER={SCAN_CROSSOVER}), {args.crossover_posts:,} posts per size:")
+    crossover = None
+    for n in (int(size) for size in args.crossover_sizes.split(",")):
+        sized = corpus(0, n)
+        vocab = sized.terms[:n]
+        texts = [p.text.lower() for p in sized.posts(args.crossover_posts)]
+        rates = []
+        for m in (TermMatcher(vocab, crossover=n + 1), TermMatcher(vocab, crossover=0)):
+            t0 = time.perf_counter()
+            for text in texts:
+                m.find_ids(text)
+            rates.append(len(texts) / (time.perf_counter() - t0))
+        if crossover is None and rates[1] > rates[0]:
+            crossover = n
+        print(f"  terms={n:<6,} scan {rates[0]:10,.0f} posts/s  automaton {rates[1]:10,.0f} posts/s"
+              f"  -> {'automaton' if rates[1] > rates[0] else 'scan'}")
+    print(f"  automaton first wins at {crossover if crossover is not None else 'none of these sizes'} terms")
+
+def bench_scrape(args):
+    server, base = fake_feed_server(args.latency_ms / 1000, args.page_size, corpus(0, 200).terms)
+    locations = [f"Neighborhood {i}" for i in range(args.locations)]
+    print(f"locations={args.locations} platforms={len(ADAPTERS)} latency={args.latency_ms}ms page={args.page_size}")
+    try:
+        for workers in sorted({1, args.workers}):
+            engine = ScrapeEngine([cls(f"{base}/{name}") for name, cls in ADAPTERS.items()],
+                                  max_workers=workers, per_host=workers)
+            t0 = time.perf_counter()
+            n = sum(1 for _ in engine.iter_posts(locations))
+            elapsed = time.perf_counter() - t0
+            engine.close()
+            print(f"  workers={workers:<3} {elapsed:7.2f} s  {args.locations / elapsed:7.1f} locations/s"
+                  f"  {n / elapsed:9,.0f} posts/s  errors={len(engine.errors)}")
+    finally:
+        server.shutdown()
+
+def bench_llm_client(args):
+    server, base = stub_messages_server(args.latency_ms / 1000)
+    request = dict(model=MODEL, max_tokens=1024, messages=[{"role": "user", "content": "bench"}])
+    variants = {
+        "new client per call": lambda: anthropic.Anthropic(api_key="bench", base_url=base),
+        "pooled registry": lambda: get_client("bench", base_url=base),
+    }
+    print(f"calls={args.calls} stub latency={args.latency_ms}ms")
+    try:
+        for name, make_client in variants.items():
+            make_client().messages.create(**request)  # warm-up
+            timings = []
+            for _ in range(args.calls):
+                t0 = time.perf_counter()
+                make_client().messages.create(**request)
+                timings.append(time.perf_counter() - t0)
+            timings.sort()
+            print(f"  {name:<20} mean {sum(timings) / len(timings) * 1000:7.2f} ms"
+                  f"  p50 {timings[len(timings) // 2] * 1000:7.2f} ms"
+                  f"  p95 {timings[int(len(timings) * 0.95)] * 1000:7.2f} ms")
+    finally:
+        server.shutdown()
+
+def bench_llm_stream(args):
+    server, base = stub_messages_server(args.latency_ms / 1000)
+    os.environ["ANTHROPIC_BASE_URL"] = base
+    trends = {"top_ingredients": ["birria"], "all_scores": {"birria": 1}, "weekend": "bench"}
+    print(f"stub generation time={args.latency_ms}ms")
+    try:
+        t0 = time.perf_counter()
+        stream = SuggestionStream(trends, "Bistro", "bench", cache=None)
+        arrivals = [time.perf_counter() - t0 for _ in stream]
+        total = time.perf_counter() - t0
+        for i, t in enumerate(arrivals, 1):
+            print(f"  dish {i} rendered at {t * 1000:7.1f} ms")
+        print(f"  full reply parsed at {total * 1000:7.1f} ms  (first dish at {arrivals[0] / total:.0%} of total)")
+    finally:
+        server.shutdown()
+
+def bench_scrape_cache(args):
+    # Sessions ask for a few hot locations at once, then again after the TTL.
+    fetches = []
+    lock = threading.Lock()
+    posts = list(corpus(0, len(FOOD_TERMS)).posts(50))
+
+    def slow_fetch(location, platforms):
+        with lock:
+            fetches.append(location)
+        time.sleep(args.latency_ms / 1000)
+        return posts
+
+    locations = [f"Neighborhood {i}" for i in range(args.locations)]
+
+    def wave(cache) -> list[float]:
+        waits = []
+
+        def session(i: int) -> None:
+            t0 = time.perf_counter()
+            if cache is None:
+                slow_fetch(locations[i % len(locations)], None)
+            else:
+                cache.get(locations[i % len(locations)])
+            with lock:
+                waits.append(time.perf_counter() - t0)
+
+        threads = [threading.Thread(target=session, args=(i,)) for i in range(args.sessions)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return sorted(waits)
+
+    ttl = 0.2
+    print(f"sessions={args.sessions} locations={args.locations} fetch latency={args.latency_ms:.0f}ms")
+    for label, cache in (("uncached", None), ("ScrapeCache", ScrapeCache(slow_fetch, ttl=ttl, stale=60))):
+        fetches.clear()
+        cold = wave(cache)
+        time.sleep(ttl * 1.5)  # past the TTL: the next wave is served stale
+        warm = wave(cache)
+        deadline = time.time() + 30
+        while cache is not None and cache.stats()["refreshes"] < args.locations and time.time() < deadline:
+            time.sleep(0.01)  # let background refreshes land
+        p95 = lambda w: w[int(len(w) * 0.95) - 1] * 1000
+        print(f"  {label:<12} fetches={len(fetches):4}  first wave p95 {p95(cold):7.1f} ms  "
+              f"after TTL p95 {p95(warm):7.1f} ms")
+        if cache is not None:
+            stats = cache.stats()
+            print(f"  {'':<12} hit rate {stats['hit_rate']:.0%}  ({stats['coalesced']} coalesced, "
+                  f"{stats['stale']} stale, {stats['refreshes']} background refreshes)")
+            if len(fetches) != 2 * args.locations:
+                raise SystemExit(f"expected one fetch per location per wave, got {len(fetches)}")
+
+def bench_store(args):
+    # Text payloads are shared by both layouts and left out, so the numbers are per-post overhead.
+    tracemalloc.start()
+    posts = list(corpus(2, 500, args.locations).posts(args.posts))
+    text_bytes = sum(sys.getsizeof(p.text) for p in posts)
+    dict_bytes = tracemalloc.get_traced_memory()[0] - text_bytes
+    tracemalloc.stop()
+    tracemalloc.start()
+    store = PostStore.from_posts(posts)
+    store.columns
+    store_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"posts={args.posts:,} locations={args.locations}")
+    print(f"  list[Post]  {dict_bytes / args.posts:7.1f} bytes/post")
+    print(f"  PostStore   {store_bytes / args.posts:7.1f} bytes/post  ({dict_bytes / store_bytes:.1f}x smaller)")
+
+    def dict_group_by():
+        totals = {}
+        for p in posts:
+            key = (p.platform, p.location)
+            totals[key] = totals.get(key, 0) + p.likes
+        return totals
+
+    for name, fn in (("Post loop platform x location", dict_group_by),
+                     ("PostStore.sum_by", lambda: store.sum_by("platform", "location"))):
+        t0 = time.perf_counter()
+        result = fn()
+        print(f"  {name:<30} {(time.perf_counter() - t0) * 1000:9.1f} ms")
+    if result != dict_group_by():
+        raise SystemExit("PostStore group-by diverges from the Post loop")
+
+def bench_records(args):
+    rows = [(p.platform.value, p.text, p.likes, p.location, p.ts) for p in corpus(10).posts(args.posts)]
+
+    def fresh(s: str) -> str:
+        return (s + " ")[:-1]  # a new string object, as a parser would hand back
+
+    # The old shape: one dict per post with parsed, un-interned strings and an ISO timestamp.
+    tracemalloc.start()
+    dicts = [{"platform": fresh(p), "text": t, "likes": n, "location": fresh(loc),
+              "scraped_at": datetime.fromtimestamp(ts).isoformat()} for p, t, n, loc, ts in rows]
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    tracemalloc.start()
+    records = [Post.make(fresh(p), t, n, fresh(loc), ts) for p, t, n, loc, ts in rows]
+    record_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"posts={args.posts:,}  (text shared by both layouts)")
+    print(f"  dict        {dict_bytes / args.posts:7.1f} bytes/post")
+    print(f"  Post        {record_bytes / args.posts:7.1f} bytes/post  ({dict_bytes / record_bytes:.1f}x smaller)")
+
+    def dict_loop():
+        totals, newest = {}, 0.0
+        for p in dicts:
+            totals[p["platform"]] = totals.get(p["platform"], 0) + p["likes"]
+            newest = max(newest, datetime.fromisoformat(p["scraped_at"]).timestamp())
+        return totals, int(newest)
+
+    def record_loop():
+        totals, newest = {}, 0
+        for p in records:
+            totals[p.platform] = totals.get(p.platform, 0) + p.likes
+            newest = max(newest, p.ts)
+        return totals, newest
+
+    for name, fn in (("dict keys + ISO parse", dict_loop), ("Post attributes", record_loop)):
+        t0 = time.perf_counter()
+        result = fn()
+        print(f"  {name:<24} {(time.perf_counter() - t0) * 1000:9.1f} ms  likes by platform + newest post")
+    if result != dict_loop():
+        raise SystemExit("Post loop diverges from dict loop")
+
+def bench_index(args):
+    rng = random.Random(3)
+    source = corpus(3, args.terms)
+    terms, platforms, locations = source.terms, source.platforms, source.locations
+    posts = list(source.posts(args.posts))
+    index = TermIndex()
+    t0 = time.perf_counter()
+    TrendAccumulator(TermMatcher(terms), index).update(posts)
+    print(f"posts={args.posts:,} terms={len(terms):,}  analyze+index {time.perf_counter() - t0:.2f} s")
+
+    queries = [(rng.choice(terms), rng.choice([None, rng.choice(locations)]), rng.choice([None, rng.choice(platforms)]))
+               for _ in range(args.queries)]
+    for label in ("first query (sorts postings)", "warm query"):
+        t0 = time.perf_counter()
+        for term, loc, platform in queries:
+            index.top_posts(term, 10, location=loc, platform=platform)
+        print(f"  {label:<30} {(time.perf_counter() - t0) / len(queries) * 1e6:8.1f} µs/query")
+
+def bench_archive(args):
+    locations = [f"Neighborhood {i}" for i in range(40)]
+    start = time.time() - args.days * 86400
+    with tempfile.TemporaryDirectory() as root:
+        archive = PostArchive(root)
+        t0 = time.perf_counter()
+        per_day = args.posts // args.days
+        for day in range(args.days):
+            archive.append(corpus(day, days=1, end=start + (day + 1) * 86400).posts(per_day))
+        write = time.perf_counter() - t0
+        size = sum(os.path.getsize(os.path.join(d, f)) for d, _, fs in os.walk(root) for f in fs)
+
+        reader = PostArchive(root)
+        t0 = time.perf_counter()
+        rows = sum(len(seg.select()) for seg in reader.segments())
+        open_scan = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        week = list(reader.scan(start=start + (args.days - 7) * 86400, locations=locations[:4]))
+        ranged = time.perf_counter() - t0
+
+    print(f"posts={per_day * args.days:,} segments={args.days}  {size / 1e6:.1f} MB on disk "
+          f"({size / (per_day * args.days):.0f} bytes/post)")
+    print(f"  append                  {write:8.2f} s")
+    print(f"  mmap open + full select {open_scan * 1000:8.1f} ms  ({rows:,} rows)")
+    print(f"  7-day, 4-location scan  {ranged * 1000:8.1f} ms  ({len(week):,} posts decoded)")
+
+def bench_incremental(args):
+    rng = random.Random(5)
+    # Seeds differ, so post IDs ("syn-<seed>-<n>") don't collide between the two.
+    source = corpus(5, args.terms, locations=1)
+    matcher = TermMatcher(source.terms)
+    posts = list(source.posts(args.posts))
+    new = list(SyntheticCorpus(6, args.terms, locations=source.locations, end=BENCH_END).posts(args.new))
+    analyzer = IncrementalAnalyzer(matcher).apply(posts)
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "state.json")
+        t0 = time.perf_counter()
+        analyzer.save(path)
+        analyzer = IncrementalAnalyzer.load(path, matcher)
+        persist = time.perf_counter() - t0
+
+    updates = {}
+    for i in rng.sample(range(args.posts), args.like_updates):
+        posts[i] = posts[i]._replace(likes=posts[i].likes + rng.randint(1, 500))
+        updates[post_id(posts[i])] = posts[i].likes
+    t0 = time.perf_counter()
+    delta = analyzer.apply(new, updates).snapshot()
+    incremental = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    full = TrendAccumulator(matcher).update(posts + new).snapshot()
+    recompute = time.perf_counter() - t0
+    assert delta["all_scores"] == full["all_scores"]
+
+    print(f"posts={args.posts:,} terms={len(matcher.terms):,}  delta: {args.new:,} new posts, "
+          f"{args.like_updates:,} like updates")
+    print(f"  full recompute   {recompute * 1000:9.1f} ms")
+    print(f"  incremental      {incremental * 1000:9.1f} ms  ({recompute / incremental:.0f}x)")
+    print(f"  save + load      {persist * 1000:9.1f} ms")
+
+def bench_sketch(args):
+    # Open vocabulary: Zipf-distributed term ranks with Pareto-tailed likes.
+    rng = np.random.default_rng(6)
+    ranks = rng.zipf(args.zipf, args.events)
+    likes = (rng.pareto(1.5, args.events) * 20).astype(np.int64) + 1
+    stream = [(f"term-{r}", int(w)) for r, w in zip(ranks, likes)]
+
+    def run(sink):
+        # Timed untraced; peak memory comes from a second, traced pass.
+        t0 = time.perf_counter()
+        state = sink(stream)
+        elapsed = time.perf_counter() - t0
+        tracemalloc.start()
+        sink(stream)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return state, elapsed, peak
+
+    def exact_sink(events):
+        scores = {}
+        for term, w in events:
+            scores[term] = scores.get(term, 0) + w
+        return scores
+
+    def sketch_sink(events):
+        hh = HeavyHitters(args.k, args.width, args.depth)
+        for term, w in events:
+            hh.add(term, w)
+        return hh
+
+    exact, exact_s, exact_mem = run(exact_sink)
+    hh, sketch_s, sketch_mem = run(sketch_sink)
+    truth = sorted(exact, key=exact.get, reverse=True)
+    bounds = hh.bounds()
+    approx = sorted(bounds, key=lambda t: bounds[t].high, reverse=True)
+    report = hh.error_report()
+    print(f"events={args.events:,} distinct terms={len(exact):,}  k={args.k} "
+          f"cms={args.depth}x{args.width}  total likes={report['total_likes']:,}")
+    print(f"  exact dict   {exact_s:6.2f} s  peak {exact_mem / 1e6:8.2f} MB")
+    print(f"  sketch       {sketch_s:6.2f} s  peak {sketch_mem / 1e6:8.2f} MB")
+    for n in (10, 50):
+        recall = len(set(truth[:n]) & set(approx[:n])) / n
+        rel = max(abs(bounds[t].high - exact[t]) / exact[t] if t in bounds else 1.0 for t in truth[:n])
+        print(f"  top-{n:<3} recall {recall:6.1%}   max relative error {rel:7.3%}")
+    held = sum(b.low <= exact[t] <= b.high for t, b in bounds.items())
+    worst = max(bounds[t].high - exact[t] for t in bounds)
+    print(f"  per-term bounds hold for {held}/{len(bounds)} tracked terms")
+    print(f"  worst overcount {worst:,} likes vs. CMS bound {report['cms_overcount']:,} "
+          f"(p={report['cms_confidence']:.3f}); terms above {report['guaranteed_above']:,} likes always tracked")
+
+def bench_discovery(args):
+    # Half the posts also tag their terms as squashed hashtags. The baseline
+    # window shares FOOD_TERMS and the phrasing but draws different dishes.
+    source = corpus(7, args.terms, hashtag_rate=0.5)
+    posts = list(source.posts(args.posts))
+    reference = corpus(99, args.terms)
+    baseline = TermDiscovery().update(reference.posts(args.posts // 4))
+
+    print(f"terms={args.terms:,}  baseline posts={baseline.posts:,}")
+    rates = []
+    for n in (args.posts // 4, args.posts // 2, args.posts):
+        t0 = time.perf_counter()
+        discovery = TermDiscovery().update(posts[:n])
+        scan = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        promoted = discovery.promote(baseline, k=50)
+        promote = time.perf_counter() - t0
+        rates.append(n / scan)
+        print(f"  posts={n:>9,}  scan {scan:6.2f} s ({n / scan:7,.0f} posts/s)  promote {promote * 1000:7.1f} ms  "
+              f"candidates={len(discovery.df):,}")
+    planted = set(source.terms) - set(reference.terms)
+    print(f"  throughput drift across sizes: {min(rates) / max(rates):.2f} (1.00 = linear)")
+    print(f"  {sum(d.term in planted for d in promoted)}/{len(promoted)} promoted terms are planted terms; "
+          f"without baseline: {sum(d.term in planted for d in discovery.promote(k=50))}/50")
+
+def bench_shard(args):
+    source = corpus(8, args.terms, args.locations)
+    matcher = TermMatcher(source.terms)
+    posts = list(source.posts(args.posts))
+    print(f"posts={args.posts:,} terms={len(matcher.terms):,} locations={args.locations} by={args.by} "
+          f"cores={os.cpu_count()}")
+    # Partitioning runs in the parent; it bounds the speedup (Amdahl).
+    t0 = time.perf_counter()
+    partition(posts, 8, args.by)
+    print(f"  serial partition step {time.perf_counter() - t0:.2f} s")
+    reference = None
+    base = None
+    for workers in (int(w) for w in args.workers.split(",")):
+        t0 = time.perf_counter()
+        result = analyze_trends_sharded(posts, workers, args.by, matcher)
+        elapsed = time.perf_counter() - t0
+        if reference is None:
+            reference, base = result["all_scores"], elapsed
+        assert list(result["all_scores"].items()) == list(reference.items())
+        print(f"  workers={workers:<3} {elapsed:7.2f} s  {args.posts / elapsed:10,.0f} posts/s  "
+              f"speedup {base / elapsed:5.2f}x  efficiency {base / elapsed / workers:4.0%}")
+
+def bench_rerun(args):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), args.script),
+                            default_timeout=120).run()
+    app.selectbox[0].select("All")
+    app.button[1].click().run()
+
+    def rerun(clear: bool) -> float:
+        times = []
+        for _ in range(args.reruns):
+            if clear:
+                st.cache_data.clear()
+                st.cache_resource.clear()
+            t0 = time.perf_counter()
+            app.run()
+            times.append(time.perf_counter() - t0)
+        assert not app.exception, app.exception
+        return sorted(times)[len(times) // 2]
+
+    cold, warm = rerun(clear=True), rerun(clear=False)
+    print(f"{args.script}: {len(app.session_state['results']['posts'])} posts, median of {args.reruns} reruns "
+          f"with unchanged results")
+    print(f"  render caches cleared  {cold * 1000:7.1f} ms")
+    print(f"  render caches warm     {warm * 1000:7.1f} ms  ({cold / warm:.1f}x)")
+
+def bench_feed(args):
+    from streamlit.testing.v1 import AppTest
+
+    source = corpus(9, len(FOOD_TERMS), end=None)
+    posts = list(source.posts(args.posts))
+    word = "birria"
+
+    t0 = time.perf_counter()
+    feed = FeedIndex(posts)
+    build = time.perf_counter() - t0
+
+    def timed(fn, repeat: int = 1) -> float:
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        return (time.perf_counter() - t0) / repeat
+
+    print(f"posts={args.posts:,}  FeedIndex build {build * 1000:.0f} ms")
+    print(f"  facet filter            {timed(lambda: feed.query('', 'tiktok', source.locations[0])) * 1e6:9.1f} us")
+    print(f"  search, cold            {timed(lambda: feed.query(word, 'tiktok')) * 1e6:9.1f} us")
+    print(f"  search, cached          {timed(lambda: feed.query(word, 'tiktok'), 1000) * 1e6:9.1f} us")
+
+    index = TermIndex()
+    app = AppTest.from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), args.script),
+                            default_timeout=300)
+    app.session_state["results"] = {
+        "trends": analyze_trends(posts, index=index), "suggestions": STUB_SUGGESTIONS, "report": "",
+        "posts": posts, "index": index, "key": "bench-feed", "feed": feed,
+    }
+    print(f"{args.script} with {args.posts:,} posts loaded")
+    print(f"  first render            {timed(app.run) * 1000:9.1f} ms")
+    print(f"  rerun, unchanged        {timed(app.run) * 1000:9.1f} ms")
+    print(f"  search                  {timed(lambda: app.text_input(key='feed_query').input(word).run()) * 1000:9.1f} ms")
+    print(f"  next page               {timed(lambda: app.number_input(key='feed_page').increment().run()) * 1000:9.1f} ms")
+    assert not app.exception, app.exception
+    cards = sum(m.value.count("post-item") for m in app.markdown)
+    print(f"  post cards sent per rerun: {cards}")
+
+_STARTUP_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import streamlit
+from streamlit.testing.v1 import AppTest
+t1 = time.perf_counter()
+preloaded = set(sys.modules)
+app = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+t2 = time.perf_counter()
+heavy = [m for m in ("anthropic", "plotly.express", "numpy", "bs4", "requests")
+         if m in sys.modules and m not in preloaded]
+app.button[1].click().run()
+t3 = time.perf_counter()
+assert not app.exception, app.exception
+print(json.dumps({"streamlit": t1 - t0, "first_paint": t2 - t1, "first_results": t3 - t2, "heavy": heavy}))
+"""
+
+def bench_startup(args):
+    # Each sample is a fresh interpreter, so every import is cold. Streamlit
+    # itself is preloaded by `streamlit run`; first paint is the first script
+    # run of a new server, up to the welcome page.
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), args.script)
+    samples = []
+    for _ in range(args.runs):
+        out = subprocess.run([sys.executable, "-c", _STARTUP_PROBE, script], capture_output=True, text=True,
+                             check=True, cwd=os.path.dirname(script))
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    def median(key: str) -> float:
+        return sorted(s[key] for s in samples)[len(samples) // 2] * 1000
+
+    print(f"{args.script}: median of {args.runs} cold starts")
+    print(f"  import streamlit         {median('streamlit'):7.0f} ms")
+    print(f"  first paint (welcome)    {median('first_paint'):7.0f} ms")
+    print(f"  demo click to results    {median('first_results'):7.0f} ms")
+    print(f"  heavy modules imported by the app before first paint: {', '.join(samples[-1]['heavy']) or 'none'}")
+
+# ─────────────────────────────────────────────────────────────────────────────
+# STAGE SUITE
+# ─────────────────────────────────────────────────────────────────────────────
+
+class SuiteStage(NamedTuple):
+    run: Callable  # (corpus, n, trends) -> result
+    streams: bool  # reads the corpus as a stream, in bounded memory
+    reads_corpus: bool = True
+
+def _platform_totals(corpus: SyntheticCorpus, n: int) -> dict:
+    # The data behind make_platform_chart, one chunk's columnar store at a time.
+    totals: dict = {}
+    for chunk in corpus.chunks(n):
+        for platform, likes in aggregate(PostStore.from_posts(chunk)).platform.items():
+            totals[platform] = totals.get(platform, 0) + likes
+    return totals
+
+# Streaming stages regenerate the corpus as they read it; their reported time
+# has the `generate` time for that size taken off. Stages that materialise
+# hold every post at once and are skipped above --materialize-max.
+SUITE_STAGES = {
+    "generate": SuiteStage(lambda corpus, n, trends: deque(corpus.posts(n), maxlen=0), streams=True),
+    "analyze": SuiteStage(lambda corpus, n, trends: analyze_trends(corpus.posts(n)), streams=True),
+    "platform": SuiteStage(lambda corpus, n, trends: _platform_totals(corpus, n), streams=True),
+    "feed": SuiteStage(lambda corpus, n, trends: FeedIndex(list(corpus.posts(n))), streams=False),
+    "report": SuiteStage(lambda corpus, n, trends: generate_report(trends, DEMO_SUGGESTIONS), streams=True,
+                         reads_corpus=False),
+}
+
+def _git_revision() -> tuple[str, bool]:
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    capture_output=True, text=True).stdout.strip())
+        return rev, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+
+def _measure(fn, repeat: int, memory: bool) -> tuple[float, Optional[int], object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        result = None
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    peak = None
+    if memory:
+        # A separate traced pass: tracemalloc slows allocation-heavy code several-fold.
+        result = None
+        tracemalloc.start()
+        result = fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak, result
+
+def bench_suite(args):
+    rev, dirty = _git_revision()
+    history = []
+    if os.path.exists(args.history):
+        with open(args.history) as f:
+            history = [json.loads(line) for line in f if line.strip()]
+    stages = args.stages.split(",")
+    corpus = SyntheticCorpus(args.seed, end=BENCH_END)
+    records = []
+    print(f"revision={rev}{'+dirty' if dirty else ''} seed={args.seed} repeat={args.repeat}")
+    print(f"  {'stage':<9} {'posts':>11} {'seconds':>9} {'posts/s':>12} {'peak MB':>9}  vs. last other revision")
+    for n in (int(size) for size in args.sizes.split(",")):
+        trends = analyze_trends(corpus.posts(n))
+        generate = None
+        if any(SUITE_STAGES[stage].reads_corpus for stage in stages):
+            # Subtracted from every corpus-reading stage, so take the best of at least three.
+            generate, _, _ = _measure(lambda: SUITE_STAGES["generate"].run(corpus, n, None), max(args.repeat, 3), False)
+        for stage in stages:
+            spec = SUITE_STAGES[stage]
+            if not spec.streams and n > args.materialize_max:
+                print(f"  {stage:<9} {n:>11,}  skipped: materialises every post (--materialize-max {args.materialize_max:,})")
+                continue
+            if stage == "generate":
+                seconds, peak, _ = _measure(lambda: spec.run(corpus, n, trends), 1, not args.no_memory)
+                seconds = generate
+            else:
+                seconds, peak, _ = _measure(lambda: spec.run(corpus, n, trends), args.repeat, not args.no_memory)
+                if spec.reads_corpus:
+                    seconds = max(seconds - generate, 1e-9)
+            record = {"revision": rev, "dirty": dirty, "date": datetime.now().isoformat(timespec="seconds"),
+                      "stage": stage, "posts": n, "seconds": seconds, "posts_per_s": n / seconds,
+                      "peak_bytes": peak, "streamed": spec.streams, "python": sys.version.split()[0]}
+            records.append(record)
+            last = next((r for r in reversed(history)
+                         if (r["stage"], r["posts"]) == (stage, n) and r["revision"] != rev), None)
+            change = f"{last['seconds'] / seconds:5.2f}x speed @ {last['revision']}" if last else "—"
+            if last and peak and last.get("peak_bytes"):
+                change += f", {peak / last['peak_bytes']:5.2f}x memory"
+            peak_mb = f"{peak / 2**20:9.1f}" if peak is not None else f"{'—':>9}"
+            print(f"  {stage:<9} {n:>11,} {seconds:9.3f} {n / seconds:12,.0f} {peak_mb}  {change}")
+    if not args.dry_run:
+        os.makedirs(os.path.dirname(args.history) or ".", exist_ok=True)
+        with open(args.history, "a") as f:
+            f.writelines(json.dumps(r) + "\n" for r in records)
+        print(f"appended {len(records)} results to {args.history}")
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CLI
+# ─────────────────────────────────────────────────────────────────────────────
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("matcher", help="compiled term matcher vs. `term in text`")
+    p.add_argument("--posts", type=int, default=1_000_000)
+    p.add_argument("--terms", type=int, default=5_000)
+    p.add_argument("--naive-sample", type=int, default=2_000,
+                   help="posts timed with the naive scan; its cost is extrapolated")
+    p.add_argument("--crossover-sizes", default="5,15,25,40,60,80,120,250,500",
+                   help="comma-separated term counts timed for the scan/automaton crossover")
+    p.add_argument("--crossover-posts", type=int, default=20_000)
+    p.set_defaults(func=bench_matcher)
+
+    p = sub.add_parser("scrape", help="concurrent platform adapters against a local fake feed server")
+    p.add_argument("--locations", type=int, default=40)
+    p.add_argument("--workers", type=int, default=16)
+    p.add_argument("--latency-ms", type=float, default=50)
+    p.add_argument("--page-size", type=int, default=25)
+    p.set_defaults(func=bench_scrape)
+
+    p = sub.add_parser("llm-client", help="per-call Anthropic client vs. pooled registry against a local stub")
+    p.add_argument("--calls", type=int, default=200)
+    p.add_argument("--latency-ms", type=float, default=0)
+    p.set_defaults(func=bench_llm_client)
+
+    p = sub.add_parser("llm-stream", help="time to first dish card with streamed, incrementally parsed replies")
+    p.add_argument("--latency-ms", type=float, default=2000, help="simulated full generation time")
+    p.set_defaults(func=bench_llm_stream)
+
+    p = sub.add_parser("scrape-cache", help="identical scrapes from many sessions: TTL cache with coalescing and stale-while-revalidate")
+    p.add_argument("--sessions", type=int, default=200)
+    p.add_argument("--locations", type=int, default=5)
+    p.add_argument("--latency-ms", type=float, default=300)
+    p.set_defaults(func=bench_scrape_cache)
+
+    p = sub.add_parser("store", help="columnar PostStore vs. list of dicts: memory and group-by")
+    p.add_argument("--posts", type=int, default=1_000_000)
+    p.add_argument("--locations", type=int, default=40)
+    p.set_defaults(func=bench_store)
+
+    p = sub.add_parser("records", help="Post records vs. post dicts: bytes per post and a hot read loop")
+    p.add_argument("--posts", type=int, default=1_000_000)
+    p.set_defaults(func=bench_records)
+
+    p = sub.add_parser("index", help="top-k contributing posts per term / location / platform")
+    p.add_argument("--posts", type=int, default=200_000)
+    p.add_argument("--terms", type=int, default=5_000)
+    p.add_argument("--queries", type=int, default=10_000)
+    p.set_defaults(func=bench_index)
+
+    p = sub.add_parser("archive", help="segment archive: append, mmap open and range scans")
+    p.add_argument("--posts", type=int, default=300_000)
+    p.add_argument("--days", type=int, default=90)
+    p.set_defaults(func=bench_archive)
+
+    p = sub.add_parser("incremental", help="apply a small delta to saved trend state vs. a full recompute")
+    p.add_argument("--posts", type=int, default=500_000)
+    p.add_argument("--terms", type=int, default=1_000)
+    p.add_argument("--new", type=int, default=1_000)
+    p.add_argument("--like-updates", type=int, default=1_000)
+    p.set_defaults(func=bench_incremental)
+
+    p = sub.add_parser("sketch", help="heavy-hitter sketch vs. exact dict on an open vocabulary")
+    p.add_argument("--events", type=int, default=2_000_000, help="(term, likes) matches in the stream")
+    p.add_argument("--zipf", type=float, default=1.3)
+    p.add_argument("--k", type=int, default=256)
+    p.add_argument("--width", type=int, default=2048)
+    p.add_argument("--depth", type=int, default=4)
+    p.set_defaults(func=bench_sketch)
+
+    p = sub.add_parser("discovery", help="hashtag / n-gram candidate extraction and promotion at growing sizes")
+    p.add_argument("--posts", type=int, default=200_000)
+    p.add_argument("--terms", type=int, default=500)
+    p.set_defaults(func=bench_discovery)
+
+    p = sub.add_parser("shard", help="process-pool sharded analysis: throughput vs. worker count")
+    p.add_argument("--posts", type=int, default=2_000_000)
+    p.add_argument("--terms", type=int, default=1_000)
+    p.add_argument("--locations", type=int, default=48)
+    p.add_argument("--by", choices=("location", "hash"), default="location")
+    p.add_argument("--workers", default="1,2,4,8", help="comma-separated worker counts")
+    p.set_defaults(func=bench_shard)
+
+    p = sub.add_parser("rerun", help="Streamlit rerun cost with unchanged results, render caches cold vs. warm")
+    p.add_argument("--script", default="app.py")
+    p.add_argument("--reruns", type=int, default=20)
+    p.set_defaults(func=bench_rerun)
+
+    p = sub.add_parser("feed", help="paged Social Feed: FeedIndex queries and app reruns with a large post set")
+    p.add_argument("--posts", type=int, default=100_000)
+    p.add_argument("--script", default="app.py")
+    p.set_defaults(func=bench_feed)
+
+    p = sub.add_parser("startup", help="cold start: streamlit import, first paint and first results in fresh processes")
+    p.add_argument("--script", default="app.py")
+    p.add_argument("--runs", type=int, default=5)
+    p.set_defaults(func=bench_startup)
+
+    p = sub.add_parser("suite", help="per-stage throughput and peak memory on the synthetic corpus, logged per revision")
+    p.add_argument("--sizes", default="10000,100000,1000000", help="comma-separated corpus sizes")
+    p.add_argument("--stages", default=",".join(SUITE_STAGES), help=f"comma-separated subset of {','.join(SUITE_STAGES)}")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--repeat", type=int, default=3, help="timed runs per stage; the best is kept")
+    p.add_argument("--no-memory", action="store_true", help="skip the traced peak-memory pass")
+    p.add_argument("--materialize-max", type=int, default=1_000_000,
+                   help="largest size at which stages that hold every post in memory still run")
+    p.add_argument("--history", default=os.path.join(os.environ.get("FOOD_AGENT_CACHE_DIR", ".food_agent_cache"),
+                                                     "bench_history.jsonl"))
+    p.add_argument("--dry-run", action="store_true", help="compare against the history without appending")
+    p.set_defaults(func=bench_suite)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
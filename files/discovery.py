@@ -0,0 +1,186 @@
+"""
+Hyper-Local Food Trend Agent — Term Discovery
+Hashtag and 1–3-gram candidates | normalized, nesting-aware and lift-ranked in one pass
+"""
+
+import re
+from typing import Iterable, NamedTuple, Optional
+
+from records import Post
+from trends import FOOD_TERMS
+
+# Generic English function words; noise beyond these is left to the min-posts and lift thresholds.
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any anyone anything are aren't as at be
+because been before being below between both but by can can't cannot could couldn't did didn't do
+does doesn't doing don't down during each even ever every everyone everything few for from further
+get gets got had hadn't has hasn't have haven't having he he's her here here's hers herself him
+himself his how how's i i'd i'll i'm i've if in into is isn't it it's its itself just let's like me
+more most much must my myself no nor not now nothing of off on once only or other ought our ours
+ourselves out over own really same she she's should shouldn't so some someone something still such
+than that that's the their theirs them themselves then there there's these they they're this those
+through to too under until up us very was wasn't we we're we've were weren't what what's when where
+which while who who's whom why will with won't would wouldn't yet you you'd you'll you're you've
+your yours yourself yourselves
+""".split())
+
+# Hashtags and words; anything other than spaces between two words ends an n-gram run.
+TOKEN_RE = re.compile(r"#(\w+)|[^\W\d_]+(?:'[^\W\d_]+)?")
+
+
+def singular(word: str) -> str:
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def term_key(words: Iterable[str]) -> str:
+    """Spacing- and plural-insensitive key: "smash burgers" and "#smashburger" share one."""
+    return "".join(singular(w) for w in words)
+
+
+class Discovered(NamedTuple):
+    term: str
+    posts: int
+    likes: int
+    lift: Optional[float]
+    known: bool
+
+
+class TermDiscovery:
+    """Post and like counts for every hashtag and 1–3-gram candidate.
+
+    Each post credits a candidate at most once. Candidates are merged on
+    `term_key`, and displayed in their known or most common spaced form.
+    `promote` discounts a shorter term's counts by the promoted longer
+    terms that contain it, so "chocolate" isn't also scored for every
+    "dubai chocolate" post.
+    """
+
+    def __init__(self, known: Iterable[str] = FOOD_TERMS, max_n: int = 3):
+        self.max_n = max_n
+        # (offset, length - 1) of every proper sub-gram of an n-gram
+        self._sub_spans = [[(j, m) for j in range(n) for m in range(min(n - 1, n - j))] for n in range(max_n + 1)]
+        self.known = {term_key(term.split()): term for term in known}
+        self.posts = 0
+        self.df: dict[str, int] = {}
+        self.likes: dict[str, int] = {}
+        self._forms: dict[str, dict[str, int]] = {}
+        # sub-gram -> set of longer grams -> [posts, likes] for posts where
+        # every spaced occurrence of the sub-gram sat inside each of them.
+        self._covered: dict[str, dict[frozenset, list[int]]] = {}
+
+    def _runs(self, text: str) -> tuple[list[str], list[list[str]]]:
+        tags, runs, run, last_end = [], [], [], 0
+        for m in TOKEN_RE.finditer(text):
+            if m.group(1):
+                tags.append(m.group(1))
+                run = []
+                continue
+            if run and text[last_end:m.start()].strip():
+                run = []
+            if not run:
+                runs.append(run)
+            run.append(m.group())
+            last_end = m.end()
+        return tags, runs
+
+    def add(self, post: Post) -> None:
+        tags, runs = self._runs(post.text.lower())
+        max_n, sub_spans = self.max_n, self._sub_spans
+        occurrences: dict[str, int] = {}
+        grams: dict[str, tuple[str, ...]] = {}
+        # (key, {sub-gram key: occurrences inside it}) per multi-word occurrence
+        nested: list[tuple[str, dict[str, int]]] = []
+        for run in runs:
+            words = [singular(w) for w in run]
+            # keys[i][n - 1]: key of the n-gram starting at word i, or None if filtered
+            keys = []
+            for i, first in enumerate(words):
+                row = []
+                edge_ok = first not in STOPWORDS
+                for n in range(1, min(max_n, len(words) - i) + 1):
+                    last = words[i + n - 1]
+                    key = None
+                    if edge_ok and last not in STOPWORDS and len(last) >= 3:
+                        key = first if n == 1 else "".join(words[i:i + n])
+                        occurrences[key] = occurrences.get(key, 0) + 1
+                        if key not in grams:
+                            grams[key] = tuple(words[i:i + n])
+                    row.append(key)
+                keys.append(row)
+            for i, row in enumerate(keys):
+                for n in range(2, len(row) + 1):
+                    if row[n - 1] is None:
+                        continue
+                    inside: dict[str, int] = {}
+                    for j, m in sub_spans[n]:
+                        sub = keys[i + j][m]
+                        if sub is not None:
+                            inside[sub] = inside.get(sub, 0) + 1
+                    nested.append((row[n - 1], inside))
+        found = set(grams)
+        found.update(key for key in (term_key([tag]) for tag in tags)
+                     if key not in STOPWORDS and len(key) >= 3 and not key.isdigit())
+
+        likes = post.likes
+        df, total, forms = self.df, self.likes, self._forms
+        for key in found:
+            df[key] = df.get(key, 0) + 1
+            total[key] = total.get(key, 0) + likes
+
+        cover: dict[str, set[str]] = {}
+        for key, inside in nested:
+            for sub, n in inside.items():
+                if occurrences[sub] == n * occurrences[key]:
+                    cover.setdefault(sub, set()).add(key)
+        for key, gram in grams.items():
+            if len(gram) > 1:
+                form = " ".join(gram)
+                counts = forms.setdefault(key, {})
+                counts[form] = counts.get(form, 0) + 1
+        for sub, keys in cover.items():
+            entry = self._covered.setdefault(sub, {}).setdefault(frozenset(keys), [0, 0])
+            entry[0] += 1
+            entry[1] += likes
+        self.posts += 1
+
+    def update(self, posts: Iterable[Post]) -> "TermDiscovery":
+        for post in posts:
+            self.add(post)
+        return self
+
+    def display(self, key: str) -> str:
+        if key in self.known:
+            return self.known[key]
+        forms = self._forms.get(key)
+        return max(forms, key=forms.get) if forms else key
+
+    def promote(self, baseline: Optional["TermDiscovery"] = None, k: int = 10, min_posts: int = 2,
+                min_lift: float = 2.0) -> list[Discovered]:
+        """Top-k candidates by likes after nesting discounts.
+
+        With a `baseline` (usually an earlier window), each candidate's share
+        of posts must be at least `min_lift` times its add-one smoothed share
+        there. Without one, `lift` is None and only `min_posts` applies.
+        """
+        # Longest first, so a term's discount only involves already-decided longer terms.
+        words = {key: self.display(key).count(" ") + 1 for key, df in self.df.items() if df >= min_posts}
+        promoted: dict[str, Discovered] = {}
+        for key in sorted(words, key=lambda key: -words[key]):
+            covered = [c for grams, c in self._covered.get(key, {}).items() if any(g in promoted for g in grams)]
+            posts = self.df[key] - sum(c[0] for c in covered)
+            if posts < min_posts:
+                continue
+            lift = None
+            if baseline is not None:
+                lift = (posts / self.posts) / ((baseline.df.get(key, 0) + 1) / (baseline.posts + 1))
+                if lift < min_lift:
+                    continue
+            likes = self.likes[key] - sum(c[1] for c in covered)
+            promoted[key] = Discovered(self.display(key), posts, likes, lift, key in self.known)
+        return sorted(promoted.values(), key=lambda d: (-d.likes, d.term))[:k]
+
+
+def discover_terms(posts: Iterable[Post], baseline: Optional[TermDiscovery] = None, **kwargs) -> list[dict]:
+    return [d._asdict() for d in TermDiscovery().update(posts).promote(baseline, **kwargs)]
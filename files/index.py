@@ -0,0 +1,104 @@
+"""
+Hyper-Local Food Trend Agent — Post Indexes
+Inverted indexes from trending terms and feed search words to posts
+"""
+
+import re
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Iterable, Optional
+
+from records import Post
+
+WORD_RE = re.compile(r"\w+")
+
+
+class TermIndex:
+    """term -> like-weighted postings, sliced by location and platform.
+
+    Post IDs are positions in `posts`, in the order the analyzer saw them.
+    Each posting list is sorted by likes on first query after a write, so
+    top-k lookups only touch k entries.
+    """
+
+    def __init__(self):
+        self.posts: list[Post] = []
+        self._postings: dict[tuple, list[tuple[int, int]]] = {}
+        self._dirty: set[tuple] = set()
+
+    def __len__(self) -> int:
+        return len(self.posts)
+
+    def add(self, post: Post, terms: list[str]) -> int:
+        post_id = len(self.posts)
+        self.posts.append(post)
+        entry = (post.likes, post_id)
+        location, platform = post.location, post.platform
+        for term in terms:
+            for key in ((term, None, None), (term, location, None),
+                        (term, None, platform), (term, location, platform)):
+                self._postings.setdefault(key, []).append(entry)
+                self._dirty.add(key)
+        return post_id
+
+    def terms(self) -> list[str]:
+        return [term for term, loc, platform in self._postings if loc is None and platform is None]
+
+    def top_posts(self, term: str, k: int = 5, location: Optional[str] = None,
+                  platform: Optional[str] = None) -> list[tuple[int, int]]:
+        """The k highest-liked (post_id, likes) postings for a term."""
+        key = (term, location, platform)
+        postings = self._postings.get(key)
+        if not postings:
+            return []
+        if key in self._dirty:
+            postings.sort(key=lambda e: (-e[0], e[1]))
+            self._dirty.discard(key)
+        return [(post_id, likes) for likes, post_id in postings[:k]]
+
+
+class FeedIndex:
+    """Search and facet postings for paging through a scraped feed.
+
+    Every post is listed under its (platform, location) facets and under
+    each distinct word of its text. Posting lists hold positions in
+    `posts` in ascending order. A query intersects them once, starting
+    from the shortest. Results are kept in a small LRU, so flipping pages
+    only slices the stored list.
+    """
+
+    def __init__(self, posts: Iterable[Post], cache_size: int = 32):
+        self.posts: list[Post] = list(posts)
+        self._facets: dict[tuple, list[int]] = {}
+        self._words: dict[str, list[int]] = {}
+        self._results: "OrderedDict[tuple, list[int]]" = OrderedDict()
+        self._cache_size = cache_size
+        for i, post in enumerate(self.posts):
+            location, platform = post.location, post.platform
+            for key in ((None, None), (platform, None), (None, location), (platform, location)):
+                self._facets.setdefault(key, []).append(i)
+            for word in set(WORD_RE.findall(post.text.lower())):
+                self._words.setdefault(word, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.posts)
+
+    def query(self, text: str = "", platform: Optional[str] = None, location: Optional[str] = None) -> list[int]:
+        """Positions of posts containing every word of `text`, in feed order."""
+        words = tuple(sorted(set(WORD_RE.findall(text.lower()))))
+        key = (words, platform, location)
+        hit = self._results.get(key)
+        if hit is not None:
+            self._results.move_to_end(key)
+            return hit
+        lists = [self._facets.get((platform, location), [])]
+        lists += [self._words.get(word, []) for word in words]
+        lists.sort(key=len)
+        result = lists[0]
+        for other in lists[1:]:
+            n = len(other)
+            result = [i for i in result if (j := bisect_left(other, i)) < n and other[j] == i]
+        self._results[key] = result
+        if len(self._results) > self._cache_size:
+            self._results.popitem(last=False)
+        return result
@@ -0,0 +1,390 @@
+"""
+Hyper-Local Food Trend Agent — Claude Dish Suggestions
+Pooled client registry, prompting, response parsing, a persistent response cache and batch runs
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple, Optional
+
+from tracing import span, submit_in_context
+
+if TYPE_CHECKING:
+    import anthropic
+
+MODEL = "claude-opus-4-6"
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CLIENT REGISTRY
+# ─────────────────────────────────────────────────────────────────────────────
+
+LLM_POOL_SIZE = int(os.environ.get("FOOD_AGENT_LLM_POOL_SIZE", 20))
+LLM_KEEPALIVE = int(os.environ.get("FOOD_AGENT_LLM_KEEPALIVE", 10))
+LLM_TIMEOUT = float(os.environ.get("FOOD_AGENT_LLM_TIMEOUT", 120))
+LLM_CONNECT_TIMEOUT = float(os.environ.get("FOOD_AGENT_LLM_CONNECT_TIMEOUT", 10))
+LLM_MAX_CLIENTS = 32
+
+# Lives for the whole process (modules survive Streamlit reruns), so every
+# session using the same key shares one keep-alive connection pool.
+_CLIENTS: "OrderedDict[tuple, anthropic.Anthropic]" = OrderedDict()
+_CLIENTS_LOCK = threading.Lock()
+
+def get_client(api_key: str, base_url: Optional[str] = None) -> "anthropic.Anthropic":
+    key = (api_key, base_url)
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is not None:
+            _CLIENTS.move_to_end(key)
+            return client
+        # The SDK costs ~1 s to import; load it on the first LLM call, not at app start.
+        import anthropic
+        try:  # newer SDK releases ship their own httpx fork
+            import httpx2 as httpx
+        except ImportError:
+            import httpx
+        timeout = httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT)
+        client = anthropic.Anthropic(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=timeout,
+            http_client=anthropic.DefaultHttpxClient(
+                timeout=timeout,
+                limits=httpx.Limits(max_connections=LLM_POOL_SIZE, max_keepalive_connections=LLM_KEEPALIVE),
+            ),
+        )
+        _CLIENTS[key] = client
+        if len(_CLIENTS) > LLM_MAX_CLIENTS:
+            _CLIENTS.popitem(last=False)
+        return client
+
+# ─────────────────────────────────────────────────────────────────────────────
+# RESPONSE CACHE
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Scores are bucketed by their share of the top score, so like-count jitter
+# between runs doesn't change the fingerprint while a real shift in the
+# trend mix does.
+SCORE_BUCKETS = 10
+
+def trend_fingerprint(trends: dict, restaurant_type: str, model: str = MODEL) -> str:
+    scores = trends["all_scores"]
+    top = max(scores.values(), default=0) or 1
+    payload = {
+        "top_ingredients": sorted(t.strip().lower() for t in trends["top_ingredients"]),
+        "scores": {t.strip().lower(): round(s / top * SCORE_BUCKETS) for t, s in scores.items()},
+        "weekend": trends["weekend"],
+        "rising": sorted(trends.get("rising", [])),
+        "restaurant_type": restaurant_type.strip().lower(),
+        "model": model,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+class SuggestionCache:
+    """SQLite-backed response cache with TTL expiry and LRU eviction.
+
+    Safe to share across threads and Streamlit sessions: every operation
+    opens, commits and closes its own connection. The database file is
+    created on the first `get` or `put`. Hit/miss counters are per process.
+    """
+
+    def __init__(self, path: str, ttl: float = 6 * 3600, max_entries: int = 256):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._ready = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    with closing(sqlite3.connect(self.path, timeout=5)) as db, db:
+                        db.execute("CREATE TABLE IF NOT EXISTS suggestions (key TEXT PRIMARY KEY, "
+                                   "value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)")
+                        db.execute("CREATE INDEX IF NOT EXISTS suggestions_accessed ON suggestions (accessed)")
+                    self._ready = True
+        with closing(sqlite3.connect(self.path, timeout=5)) as db, db:
+            yield db
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._connect() as db:
+            row = db.execute("SELECT value, created FROM suggestions WHERE key = ?", (key,)).fetchone()
+            if row and now - row[1] > self.ttl:
+                db.execute("DELETE FROM suggestions WHERE key = ?", (key,))
+                row = None
+            if row:
+                db.execute("UPDATE suggestions SET accessed = ? WHERE key = ?", (now, key))
+        self._count(row is not None)
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, value: dict) -> None:
+        now = time.time()
+        with self._connect() as db:
+            db.execute("INSERT OR REPLACE INTO suggestions VALUES (?, ?, ?, ?)", (key, json.dumps(value), now, now))
+            db.execute("DELETE FROM suggestions WHERE created < ?", (now - self.ttl,))
+            db.execute("DELETE FROM suggestions WHERE key IN ("
+                       "SELECT key FROM suggestions ORDER BY accessed DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+    def clear(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with self._connect() as db:
+            db.execute("DELETE FROM suggestions")
+
+    def stats(self) -> dict:
+        entries = 0
+        if os.path.exists(self.path):
+            with self._connect() as db:
+                entries = db.execute("SELECT COUNT(*) FROM suggestions").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "entries": entries,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
+
+SUGGESTION_CACHE = SuggestionCache(
+    os.path.join(os.environ.get("FOOD_AGENT_CACHE_DIR", ".food_agent_cache"), "suggestions.sqlite"),
+    ttl=float(os.environ.get("FOOD_AGENT_SUGGESTION_TTL", 6 * 3600)),
+    max_entries=int(os.environ.get("FOOD_AGENT_SUGGESTION_CACHE_SIZE", 256)),
+)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SUGGESTIONS
+# ─────────────────────────────────────────────────────────────────────────────
+
+def build_prompt(trends: dict, restaurant_type: str) -> str:
+    rising = f"\n- Rising fastest this week: {', '.join(trends['rising'])}" if trends.get("rising") else ""
+    return f"""You are a creative restaurant consultant designing weekend specials.
+
+Local social media food trends:
+- Top trending: {', '.join(trends['top_ingredients'])}{rising}
+- Engagement scores: {json.dumps(trends['all_scores'], indent=2)}
+- Weekend: {trends['weekend']}
+- Restaurant type: {restaurant_type}
+
+Generate 4 creative weekend special dishes. Return ONLY valid JSON:
+{{
+  "dishes": [
+    {{
+      "name": "Dish Name",
+      "description": "Brief appetizing description (2 sentences)",
+      "trending_element": "trend it capitalizes on",
+      "price_range": "$XX-$XX",
+      "social_hook": "Short Instagram caption"
+    }}
+  ],
+  "marketing_headline": "Punchy weekend specials headline",
+  "key_insight": "One sentence on why these trends matter right now"
+}}"""
+
+def parse_suggestions(raw: str) -> dict:
+    raw = raw.strip()
+    if raw.startswith("```"):
+        raw = raw.split("```")[1]
+        if raw.startswith("json"):
+            raw = raw[4:]
+    return json.loads(raw.strip())
+
+def token_usage(usage) -> dict:
+    return {"input_tokens": getattr(usage, "input_tokens", None), "output_tokens": getattr(usage, "output_tokens", None)}
+
+def suggest_dishes(trends: dict, restaurant_type: str, api_key: str,
+                   cache: Optional[SuggestionCache] = SUGGESTION_CACHE,
+                   rate_limiter: Optional["RateLimiter"] = None) -> dict:
+    with span("suggest", restaurant_type=restaurant_type) as s:
+        key = trend_fingerprint(trends, restaurant_type)
+        if cache is not None and (cached := cache.get(key)) is not None:
+            s.set(cache_hit=True)
+            return cached
+        s.set(cache_hit=False)
+        if rate_limiter is not None:
+            t0 = time.perf_counter()
+            rate_limiter.acquire()
+            s.set(rate_wait_ms=round((time.perf_counter() - t0) * 1000, 3))
+        msg = get_client(api_key).messages.create(
+            model=MODEL,
+            max_tokens=1024,
+            messages=[{"role": "user", "content": build_prompt(trends, restaurant_type)}]
+        )
+        s.set(**token_usage(msg.usage))
+        suggestions = parse_suggestions(msg.content[0].text)
+        if cache is not None:
+            cache.put(key, suggestions)
+        return suggestions
+
+# ─────────────────────────────────────────────────────────────────────────────
+# STREAMING SUGGESTIONS
+# ─────────────────────────────────────────────────────────────────────────────
+
+_DISHES_RE = re.compile(r'"dishes"\s*:\s*\[')
+
+class DishStreamParser:
+    """Pulls each object out of the reply's "dishes" array as soon as it closes."""
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._in_array = False
+        self._done = False
+        self._depth = 0
+        self._start = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: str) -> list[dict]:
+        self.text += chunk
+        text = self.text
+        if not self._in_array:
+            m = _DISHES_RE.search(text, max(0, self._pos - 16))
+            if m is None:
+                self._pos = len(text)
+                return []
+            self._in_array = True
+            self._pos = m.end()
+        dishes = []
+        i = self._pos
+        while i < len(text) and not self._done:
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                if self._depth == 0:
+                    self._start = i
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    dishes.append(json.loads(text[self._start:i + 1]))
+            elif ch == "]" and self._depth == 0:
+                self._done = True
+            i += 1
+        self._pos = i
+        return dishes
+
+class SuggestionStream:
+    """Iterate to receive dishes as they stream in; `suggestions` is set once exhausted."""
+
+    def __init__(self, trends: dict, restaurant_type: str, api_key: str,
+                 cache: Optional[SuggestionCache] = SUGGESTION_CACHE):
+        self.trends = trends
+        self.restaurant_type = restaurant_type
+        self.api_key = api_key
+        self.cache = cache
+        self.suggestions: Optional[dict] = None
+        self.cached = False
+
+    def __iter__(self) -> Iterator[dict]:
+        # Not entered: the caller's code runs between yields and mustn't nest under it.
+        s = span("suggest", restaurant_type=self.restaurant_type, streamed=True)
+        try:
+            yield from self._dishes(s)
+        except BaseException as e:
+            s.finish(e)
+            raise
+        s.finish()
+
+    def _dishes(self, s) -> Iterator[dict]:
+        key = trend_fingerprint(self.trends, self.restaurant_type)
+        if self.cache is not None and (cached := self.cache.get(key)) is not None:
+            self.suggestions, self.cached = cached, True
+            s.set(cache_hit=True)
+            yield from cached["dishes"]
+            return
+        s.set(cache_hit=False)
+        parser = DishStreamParser()
+        with get_client(self.api_key).messages.stream(
+            model=MODEL,
+            max_tokens=1024,
+            messages=[{"role": "user", "content": build_prompt(self.trends, self.restaurant_type)}]
+        ) as stream:
+            for text in stream.text_stream:
+                dishes = parser.feed(text)
+                if dishes and "first_dish_ms" not in s.attrs:
+                    s.set(first_dish_ms=s.elapsed_ms())
+                yield from dishes
+            s.set(**token_usage(stream.get_final_message().usage))
+        self.suggestions = parse_suggestions(parser.text)
+        if self.cache is not None:
+            self.cache.put(key, self.suggestions)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# BATCH SUGGESTIONS
+# ─────────────────────────────────────────────────────────────────────────────
+
+class RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart across threads."""
+
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+class BatchResult(NamedTuple):
+    suggestions: Optional[dict]
+    error: Optional[str]
+
+def suggest_dishes_batch(jobs: Iterable[tuple[dict, str]], api_key: str, max_concurrency: int = 8,
+                         requests_per_minute: Optional[float] = 50,
+                         cache: Optional[SuggestionCache] = SUGGESTION_CACHE) -> list[BatchResult]:
+    """Run many (trends, restaurant_type) jobs concurrently; results come back in job order.
+
+    Jobs with the same fingerprint share one request. A failed job is
+    reported in its BatchResult and does not affect the others. Runs on the
+    regular Messages API rather than the Message Batches endpoint, whose
+    turnaround is too slow for an interactive refresh.
+    """
+    jobs = list(jobs)
+    limiter = RateLimiter(requests_per_minute / 60) if requests_per_minute else None
+    unique: dict[str, tuple[dict, str]] = {}
+    keys = []
+    for i, (trends, restaurant_type) in enumerate(jobs):
+        try:
+            key = trend_fingerprint(trends, restaurant_type)
+        except (KeyError, TypeError, AttributeError):
+            key = f"malformed-{i}"  # runs on its own and reports its error
+        unique.setdefault(key, (trends, restaurant_type))
+        keys.append(key)
+
+    def run(job: tuple[dict, str]) -> BatchResult:
+        try:
+            return BatchResult(suggest_dishes(*job, api_key, cache=cache, rate_limiter=limiter), None)
+        except Exception as e:
+            return BatchResult(None, f"{type(e).__name__}: {e}")
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(unique)))) as pool:
+        futures = [submit_in_context(pool, run, job) for job in unique.values()]
+        results = dict(zip(unique, (f.result() for f in futures)))
+    return [results[key] for key in keys]
@@ -0,0 +1,549 @@
+"""
+Hyper-Local Food Trend Agent — Pipeline
+Scrape → analyze → suggest → report | shared by the dashboard and the headless batch CLI
+Run: python pipeline.py --location Downtown --location Eastside --restaurant-type Bistro --out reports/
+"""
+
+import argparse
+import csv
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from discovery import TermDiscovery, discover_terms
+from index import TermIndex
+from matcher import TermMatcher
+from llm import suggest_dishes_batch
+from records import Post
+from tracing import TRACER, profiled, span, submit_in_context, traced
+from trends import FOOD_MATCHER, IncrementalAnalyzer, TrendVelocity, post_id
+
+# ─────────────────────────────────────────────────────────────────────────────
+# DEMO DATA
+# ─────────────────────────────────────────────────────────────────────────────
+
+DEMO_SUGGESTIONS = {
+    "marketing_headline": "This Weekend: Trending Tastes, Locally Inspired",
+    "key_insight": "Birria and smash burger culture are dominating local TikTok feeds, signaling demand for bold, shareable comfort food that photographs beautifully.",
+    "dishes": [
+        {"name": "Birria Wagyu Smash", "description": "Wagyu smash patty dipped in rich birria consommé, melted Oaxacan cheese, and crispy confit onions on a brioche bun. A crossover hit waiting to happen.", "trending_element": "birria + smash burger", "price_range": "$18–$22", "social_hook": "The smash burger got a birria glow-up 🌶️🔥"},
+        {"name": "Truffle Miso Croissant Toast", "description": "Buttery croissant toasted flat, spread with white miso caramel butter and finished with shaved black truffle and sea salt. Brunch redefined.", "trending_element": "truffle + miso caramel", "price_range": "$14–$16", "social_hook": "Brunch just evolved. Trust us ✨"},
+        {"name": "Dubai Chocolate Smash Tacos", "description": "Crispy smash-style street tacos filled with pistachio-studded Dubai chocolate ganache and pickled chilies. Sweet heat in every bite.", "trending_element": "dubai chocolate + tacos", "price_range": "$16–$20", "social_hook": "Dubai chocolate met birria tacos and we're never going back 🍫🌮"},
+        {"name": "Truffle Corn Dog Bites", "description": "Mini Korean-style corn dogs with a mozzarella core, served with truffle aioli and spiced honey. Shareworthy by design.", "trending_element": "korean corn dog + truffle", "price_range": "$12–$15", "social_hook": "Korean corn dogs got a luxury upgrade 🌭✨"},
+    ]
+}
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SCRAPE CACHE
+# ─────────────────────────────────────────────────────────────────────────────
+
+class ScrapeResult(NamedTuple):
+    posts: list[Post]
+    status: str  # "hit", "stale", "miss" (this call fetched) or "coalesced" (waited on another's fetch)
+    age: float   # seconds since the posts were fetched
+
+class _Entry:
+    __slots__ = ("posts", "fetched", "hits", "refreshing")
+
+    def __init__(self, posts: tuple[Post, ...]):
+        self.posts = posts
+        self.fetched = time.monotonic()
+        self.hits = 0
+        self.refreshing = False
+
+class ScrapeCache:
+    """Process-wide scrapes keyed by (location, platform set).
+
+    Posts are fresh for `ttl` seconds. For `stale` seconds after that,
+    readers get them at once while one background thread refetches. Past
+    that, or on first use, the caller fetches, and concurrent callers for
+    the same key wait on that fetch instead of starting their own.
+    `on_fetch` (e.g. an archive's `append`) receives every fetched batch
+    exactly once, whichever caller or background refresh fetched it; hits
+    and coalesced waits never reach it.
+    """
+
+    STATUSES = ("hit", "stale", "miss", "coalesced")
+
+    def __init__(self, fetch: Callable[[str, Optional[frozenset]], list[Post]], ttl: float = 300,
+                 stale: float = 3600, max_entries: int = 256,
+                 on_fetch: Optional[Callable[[list[Post]], object]] = None):
+        self._fetch = fetch
+        self._on_fetch = on_fetch
+        self.ttl = ttl
+        self.stale = stale
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._inflight: dict[tuple, Future] = {}
+        self._refresher: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.counts = dict.fromkeys(self.STATUSES + ("refreshes", "refresh_errors", "on_fetch_errors"), 0)
+        self.last_error: Optional[str] = None
+
+    def _load(self, key: tuple) -> _Entry:
+        entry = _Entry(tuple(self._fetch(*key)))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        if self._on_fetch is not None:
+            try:
+                self._on_fetch(list(entry.posts))
+            except Exception as e:
+                with self._lock:
+                    self.counts["on_fetch_errors"] += 1
+                    self.last_error = f"{type(e).__name__}: {e}"
+        return entry
+
+    def _refresh(self, key: tuple, old: _Entry) -> None:
+        error = None
+        with span("scrape_refresh", location=key[0]):
+            try:
+                self._load(key)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+        with self._lock:
+            self.counts["refresh_errors" if error else "refreshes"] += 1
+            self.last_error = error or self.last_error
+            old.refreshing = False
+
+    def get(self, location: str, platforms: Optional[Iterable[str]] = None) -> ScrapeResult:
+        key = (location, frozenset(platforms) if platforms is not None else None)
+        refresh = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = time.monotonic() - entry.fetched
+                if age < self.ttl:
+                    status = "hit"
+                elif age < self.ttl + self.stale:
+                    status, refresh = "stale", not entry.refreshing
+                    entry.refreshing = True
+                else:
+                    entry = None
+            if entry is not None:
+                entry.hits += 1
+                self._entries.move_to_end(key)
+            else:
+                future = self._inflight.get(key)
+                status = "coalesced" if future is not None else "miss"
+                if future is None:
+                    future = self._inflight[key] = Future()
+            self.counts[status] += 1
+            if refresh and self._refresher is None:
+                self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="scrape-refresh")
+        if entry is not None:
+            if refresh:
+                self._refresher.submit(self._refresh, key, entry)
+            return ScrapeResult(list(entry.posts), status, age)
+        if status == "coalesced":
+            entry = future.result()
+            return ScrapeResult(list(entry.posts), status, time.monotonic() - entry.fetched)
+        try:
+            entry = self._load(key)
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._inflight[key]
+        future.set_result(entry)
+        return ScrapeResult(list(entry.posts), status, 0.0)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self.counts)
+            requests = sum(counts[s] for s in self.STATUSES)
+            served = requests - counts["miss"]
+            return {**counts, "requests": requests, "entries": len(self._entries),
+                    "hit_rate": served / requests if requests else 0.0, "last_error": self.last_error}
+
+    def entries(self) -> list[dict]:
+        """One row per cached key, most recently used last."""
+        now = time.monotonic()
+        with self._lock:
+            rows = []
+            for (location, platforms), e in self._entries.items():
+                age = now - e.fetched
+                state = "fresh" if age < self.ttl else "stale" if age < self.ttl + self.stale else "expired"
+                rows.append({"location": location, "platforms": ", ".join(sorted(platforms)) if platforms else "all",
+                             "posts": len(e.posts), "age_s": round(age, 1), "hits": e.hits,
+                             "state": state + (" (refreshing)" if e.refreshing else "")})
+            return rows
+
+def _fetch_posts(location: str, platforms: Optional[frozenset]) -> list[Post]:
+    from scraper import scrape_local_trends  # requests/bs4 load on first scrape
+
+    return scrape_local_trends(location, platforms)
+
+@functools.lru_cache(maxsize=None)
+def _scrape_archive():
+    from archive import archive_from_env  # numpy loads on the first fetch, not at import
+
+    return archive_from_env()
+
+def _archive_posts(posts: list[Post]) -> None:
+    archive = _scrape_archive()
+    if archive is not None:
+        archive.append(posts)
+
+# Module state outlives Streamlit reruns and sessions: every session in the
+# process shares these scrapes. TTL 0 still coalesces concurrent fetches.
+# Every fetched batch is archived once, whichever session fetched it.
+SCRAPE_CACHE = ScrapeCache(_fetch_posts, ttl=float(os.environ.get("FOOD_AGENT_SCRAPE_TTL", 300)),
+                           stale=float(os.environ.get("FOOD_AGENT_SCRAPE_STALE", 3600)),
+                           on_fetch=_archive_posts)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# TREND STATE
+# ─────────────────────────────────────────────────────────────────────────────
+
+class LiveTrends:
+    """One IncrementalAnalyzer per location that outlives runs.
+
+    Each analysis syncs that location's analyzer to the posts in hand, so a
+    re-scrape only matches the posts that are new since the last run; the
+    rest are like-count updates and removals. Least recently used
+    locations are dropped past `max_locations`.
+    """
+
+    def __init__(self, matcher: TermMatcher = FOOD_MATCHER, max_locations: int = 256):
+        self.matcher = matcher
+        self.max_locations = max_locations
+        self._analyzers: "OrderedDict[str, IncrementalAnalyzer]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def analyze(self, location: str, posts: list[Post], index: Optional[TermIndex] = None) -> dict:
+        with self._lock:
+            analyzer = self._analyzers.get(location)
+            if analyzer is None:
+                analyzer = self._analyzers[location] = IncrementalAnalyzer(self.matcher)
+                while len(self._analyzers) > self.max_locations:
+                    self._analyzers.popitem(last=False)
+            self._analyzers.move_to_end(location)
+            analyzer.sync(posts, index)
+            return analyzer.snapshot()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._analyzers.clear()
+
+LIVE_TRENDS = LiveTrends()
+
+class TrendHistory:
+    """One TrendVelocity per (archive, location) that outlives runs.
+
+    Each archived segment is fed in once, the first time `rising` runs
+    after it was written, so a run costs only the segments appended since
+    the last. Every scrape is archived in full, so rows go through an
+    IncrementalAnalyzer keyed by post id: a post's likes count once when it
+    is first seen, and a re-scrape only adds its like delta, timed when the
+    segment was written. Posts older than the 7-day window are dropped.
+    A single scrape all carries ts≈now, so breakouts are only reported once
+    the engine is warm (has posts older than a day).
+    """
+
+    def __init__(self, matcher: TermMatcher = FOOD_MATCHER):
+        self.matcher = matcher
+        self._engines: dict[tuple, tuple[IncrementalAnalyzer, set[str], dict[str, int]]] = {}
+        self._lock = threading.Lock()
+
+    def rising(self, archive, location: str) -> Optional[list[str]]:
+        key = (archive.root, location)
+        locations = None if location == "All" else {location}
+        start = int(time.time()) - 7 * 86400
+        with self._lock:
+            analyzer, seen, held = self._engines.setdefault(
+                key, (IncrementalAnalyzer(self.matcher, TrendVelocity()), set(), {}))
+            for seg in archive.segments():
+                if seg.name in seen:
+                    continue
+                seen.add(seg.name)
+                if not seg.overlaps(start, None, locations):
+                    continue
+                written = seg.written
+                for row in seg.select(start, None, locations):
+                    post = seg.post(int(row))
+                    pid = post_id(post)
+                    if pid in held:
+                        analyzer.update_likes(pid, post.likes, written)
+                    else:
+                        analyzer.add(post, pid)
+                    held[pid] = post.ts
+            for pid in [pid for pid, ts in held.items() if ts < start]:
+                analyzer.remove(pid)
+                del held[pid]
+            velocity = analyzer.velocity
+            return velocity.breakouts() if velocity.warm else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._engines.clear()
+
+TREND_HISTORY = TrendHistory()
+
+DISCOVERY_MAX_POSTS = int(os.environ.get("FOOD_AGENT_DISCOVERY_MAX_POSTS", 5000))
+
+class DiscoveryBaselines:
+    """Discovery baselines built once per (archive, location, UTC day).
+
+    A baseline is the archived seven whole days before today; it stands in
+    for the usual vocabulary when ranking discovered terms by lift. Within
+    a day every analysis reuses it, so the archive is scanned once a day
+    per location rather than on every run.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._baselines: "OrderedDict[tuple, Optional[TermDiscovery]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, archive, location: str) -> Optional[TermDiscovery]:
+        day = int(time.time() // 86400)
+        key = (archive.root, location, day)
+        with self._lock:
+            if key in self._baselines:
+                self._baselines.move_to_end(key)
+                return self._baselines[key]
+            locations = None if location == "All" else [location]
+            with span("discovery_baseline", location=location) as s:
+                baseline = TermDiscovery().update(archive.scan(start=(day - 7) * 86400, end=day * 86400,
+                                                               locations=locations))
+                s.set(posts=baseline.posts)
+            baseline = baseline if baseline.posts else None
+            self._baselines[key] = baseline
+            while len(self._baselines) > self.max_entries:
+                self._baselines.popitem(last=False)
+            return baseline
+
+    def clear(self) -> None:
+        with self._lock:
+            self._baselines.clear()
+
+DISCOVERY_BASELINES = DiscoveryBaselines()
+
+# ─────────────────────────────────────────────────────────────────────────────
+# STAGES
+# ─────────────────────────────────────────────────────────────────────────────
+
+def scrape(location: str, platforms: Optional[Iterable[str]] = None) -> list[Post]:
+    # SCRAPE_CACHE archives what it fetches; cache hits were archived when fetched.
+    with span("scrape", location=location) as s:
+        posts, status, age = SCRAPE_CACHE.get(location, platforms)
+        s.set(posts=len(posts), cache=status, age_s=round(age, 1))
+    return posts
+
+def discovery_baseline(archive, location: str) -> Optional[TermDiscovery]:
+    return DISCOVERY_BASELINES.get(archive, location) if archive is not None else None
+
+def analyze(posts: list[Post], location: str, archive=None, index: Optional[TermIndex] = None,
+            discover: bool = True) -> dict:
+    """Trend report for one location's posts; "discovered" is left out when not `discover`."""
+    with span("analyze", location=location, posts=len(posts)) as s:
+        trends = LIVE_TRENDS.analyze(location, posts, index)
+        rising = TREND_HISTORY.rising(archive, location) if archive is not None else None
+        if rising is not None:
+            trends["rising"] = rising
+        if discover:
+            # A strided sample keeps discovery's cost flat on large scrapes; lift compares shares.
+            sample = posts[::-(-len(posts) // DISCOVERY_MAX_POSTS)] if len(posts) > DISCOVERY_MAX_POSTS else posts
+            trends["discovered"] = discover_terms(sample, discovery_baseline(archive, location))
+        s.set(terms=len(trends["all_scores"]), discovered=len(trends.get("discovered", ())),
+              rising=rising is not None)
+    return trends
+
+@traced("report")
+def generate_report(trends: dict, suggestions: dict) -> str:
+    lines = [
+        f"# 🍽️ Weekly Food Trend Report — {trends['analysis_date']}",
+        f"\n**Weekend Focus:** {trends['weekend']} · **Posts Analyzed:** {trends['total_posts_analyzed']}",
+        "\n---\n",
+        "## 📈 Top Trending Items\n",
+    ]
+    for item, score in list(trends["all_scores"].items())[:5]:
+        lines.append(f"- **{item.title()}** — {score:,} engagement points")
+    lines += [
+        "\n---\n",
+        "## 🍴 Weekend Specials\n",
+        f"> {suggestions['marketing_headline']}\n",
+    ]
+    for i, d in enumerate(suggestions["dishes"], 1):
+        lines += [
+            f"### {i}. {d['name']} ({d['price_range']})",
+            f"{d['description']}",
+            f"- 🔥 Trend: *{d['trending_element']}*",
+            f"- 📸 Hook: *\"{d['social_hook']}\"*\n",
+        ]
+    lines += ["---\n", f"## 💡 Key Insight\n\n{suggestions['key_insight']}",
+              "\n\n*Generated by Hyper-Local Food Trend Agent · Powered by Claude*"]
+    return "\n".join(lines)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# BATCH RUNNER
+# ─────────────────────────────────────────────────────────────────────────────
+
+STAGES = ("scrape", "analyze", "suggest", "report")
+
+class Job(NamedTuple):
+    location: str
+    restaurant_type: str
+
+class JobResult(NamedTuple):
+    job: Job
+    trends: Optional[dict]
+    suggestions: Optional[dict]
+    report: Optional[str]
+    timings: dict[str, float]  # per-job seconds for scrape, analyze and report
+    error: Optional[str]
+
+def run_batch(jobs: Iterable[Job], api_key: Optional[str] = None, workers: int = 8,
+              requests_per_minute: Optional[float] = 50, archive=None,
+              demo: bool = False, discover: bool = True) -> tuple[list[JobResult], dict[str, float]]:
+    """Run every job through the pipeline; returns results in job order and stage times.
+
+    Stage times hold summed per-location scrape/analyze seconds, summed report
+    seconds, and wall-clock `prepare` (scrape + analyze) and `suggest`.
+
+    Each distinct location is scraped and analyzed once, concurrently. All
+    jobs then share one rate-limited, fingerprint-deduplicated suggestion
+    batch. With `demo`, DEMO_SUGGESTIONS stand in for the LLM. Without
+    `discover`, term discovery is skipped. `archive` is read for trend
+    history and discovery baselines; SCRAPE_CACHE archives the scrapes.
+    """
+    jobs = list(jobs)
+    wall = dict.fromkeys(STAGES, 0.0)
+
+    def prepare(location: str):
+        t0 = time.perf_counter()
+        try:
+            posts = scrape(location)
+            t1 = time.perf_counter()
+            trends = analyze(posts, location, archive, discover=discover)
+        except Exception as e:
+            return None, {"scrape": time.perf_counter() - t0}, f"{type(e).__name__}: {e}"
+        return trends, {"scrape": t1 - t0, "analyze": time.perf_counter() - t1}, None
+
+    t0 = time.perf_counter()
+    locations = list(dict.fromkeys(job.location for job in jobs))
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(locations)))) as pool:
+        futures = [submit_in_context(pool, prepare, location) for location in locations]
+        prepared = dict(zip(locations, (f.result() for f in futures)))
+    wall["scrape"] = sum(p[1].get("scrape", 0.0) for p in prepared.values())
+    wall["analyze"] = sum(p[1].get("analyze", 0.0) for p in prepared.values())
+    wall["prepare"] = time.perf_counter() - t0
+
+    ready = [job for job in jobs if prepared[job.location][0] is not None]
+    t0 = time.perf_counter()
+    if demo:
+        suggested = {job: (DEMO_SUGGESTIONS, None) for job in ready}
+    else:
+        batch = suggest_dishes_batch([(prepared[job.location][0], job.restaurant_type) for job in ready], api_key,
+                                     max_concurrency=workers, requests_per_minute=requests_per_minute)
+        suggested = {job: (r.suggestions, r.error) for job, r in zip(ready, batch)}
+    wall["suggest"] = time.perf_counter() - t0
+
+    results = []
+    for job in jobs:
+        trends, timings, error = prepared[job.location]
+        timings = dict(timings)
+        suggestions, report = None, None
+        if error is None:
+            suggestions, error = suggested[job]
+        if error is None:
+            t0 = time.perf_counter()
+            report = generate_report(trends, suggestions)
+            timings["report"] = time.perf_counter() - t0
+            wall["report"] += timings["report"]
+        results.append(JobResult(job, trends, suggestions, report, timings, error))
+    return results, wall
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CLI
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _slug(text: str) -> str:
+    return re.sub(r"\W+", "-", text.lower()).strip("-")
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the food trend agent headlessly for many stores.")
+    parser.add_argument("--location", action="append", default=[], help="repeat for several locations")
+    parser.add_argument("--restaurant-type", default="Casual Dining", help="used with every --location")
+    parser.add_argument("--jobs", help="CSV with location,restaurant_type columns")
+    parser.add_argument("--out", default="reports", help="directory for the .md reports")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rpm", type=float, default=50, help="LLM requests per minute across all jobs")
+    parser.add_argument("--demo", action="store_true", help="use demo suggestions instead of calling the LLM")
+    parser.add_argument("--no-discovery", action="store_true", help="skip hashtag / n-gram term discovery")
+    parser.add_argument("--timings", help="also write per-job and per-stage timings to this JSON file")
+    parser.add_argument("--trace", help="append every span of this run to this JSONL file")
+    parser.add_argument("--profile", help="cProfile the run and dump the stats to this .prof file")
+    args = parser.parse_args(argv)
+
+    jobs = [Job(location, args.restaurant_type) for location in args.location]
+    if args.jobs:
+        with open(args.jobs, newline="") as f:
+            jobs += [Job(row["location"], row["restaurant_type"]) for row in csv.DictReader(f)]
+    if not jobs:
+        parser.error("give at least one --location or a --jobs file")
+    api_key = os.environ.get("ANTHROPIC_API_KEY")
+    if not args.demo and not api_key:
+        parser.error("set ANTHROPIC_API_KEY or pass --demo")
+
+    from archive import archive_from_env
+
+    if args.trace:
+        TRACER.export_path = args.trace
+    t0 = time.perf_counter()
+    # The profile is dumped last, so a bad --profile path can't cost the reports.
+    with span("batch", jobs=len(jobs), demo=args.demo), profiled(bool(args.profile)) as profile:
+        results, wall = run_batch(jobs, api_key, args.workers, args.rpm, archive_from_env(), args.demo,
+                                not args.no_discovery)
+    total = time.perf_counter() - t0
+
+    os.makedirs(args.out, exist_ok=True)
+    date = datetime.now().strftime("%Y-%m-%d")
+    print(f"{'job':<36} {'scrape':>8} {'analyze':>8} {'report':>8}  status", file=sys.stderr)
+    for r in results:
+        if r.report is not None:
+            path = os.path.join(args.out, f"{date}-{_slug(r.job.location)}-{_slug(r.job.restaurant_type)}.md")
+            with open(path, "w") as f:
+                f.write(r.report)
+        cells = " ".join(f"{r.timings[s] * 1000:6.0f}ms" if s in r.timings else f"{'—':>8}"
+                         for s in ("scrape", "analyze", "report"))
+        status = f"ok → {path}" if r.report is not None else f"FAILED {r.error}"
+        print(f"{r.job.location + ' / ' + r.job.restaurant_type:<36.36} {cells}  {status}", file=sys.stderr)
+    print(f"{len(results)} jobs in {total:.2f}s · scrape+analyze {wall['prepare']:.2f}s wall · "
+          f"suggest {wall['suggest']:.2f}s · report {wall['report']:.2f}s", file=sys.stderr)
+
+    if args.timings:
+        with open(args.timings, "w") as f:
+            json.dump({"total": total, "stages": wall, "spans": TRACER.histograms(), "scrape_cache": SCRAPE_CACHE.stats(),
+                       "jobs": [{**r.job._asdict(), "timings": r.timings, "error": r.error} for r in results]},
+                      f, indent=2)
+    if args.profile:
+        try:
+            profile["profiler"].dump_stats(args.profile)
+        except OSError as e:
+            print(f"warning: could not write profile to {args.profile}: {e}", file=sys.stderr)
+    if TRACER.export_error:
+        print(f"warning: could not write trace to {TRACER.export_path}: {TRACER.export_error}", file=sys.stderr)
+    return 1 if any(r.error for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
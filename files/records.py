@@ -0,0 +1,89 @@
+"""
+Hyper-Local Food Trend Agent — Post Records
+Immutable post tuples with interned platforms and locations | epoch-second timestamps, dict-style reads kept
+"""
+
+import sys
+from datetime import datetime
+from enum import Enum
+from typing import Any, NamedTuple, Optional
+
+
+class Platform(str, Enum):
+    """Known platforms. Members are the strings themselves, so they compare,
+    hash and format exactly like "tiktok" etc."""
+
+    INSTAGRAM = "instagram"
+    TIKTOK = "tiktok"
+    TWITTER = "twitter"
+    YELP = "yelp"
+
+    __str__ = str.__str__
+    __format__ = str.__format__
+    __hash__ = str.__hash__  # Enum's own hash is a Python-level call
+
+
+_PLATFORMS = {p.value: p for p in Platform}
+
+
+def as_platform(value: str) -> str:
+    """The Platform member for a known name; any other name interned as-is."""
+    return _PLATFORMS.get(value) or sys.intern(str(value))
+
+
+def as_location(value: Optional[str]) -> Optional[str]:
+    # Every post from a location shares one string object.
+    return sys.intern(str(value)) if value is not None else None
+
+
+def to_epoch(ts: Any) -> int:
+    if not ts:
+        return 0
+    if isinstance(ts, str):
+        return int(datetime.fromisoformat(ts).timestamp())
+    if isinstance(ts, datetime):
+        return int(ts.timestamp())
+    return int(ts)
+
+
+class Post(NamedTuple):
+    """One scraped post.
+
+    `ts` is epoch seconds: when the source says the post was made if it
+    says, else when it was scraped; 0 if neither is known. Build records
+    with `make` so platform and location are interned. Hot loops should
+    read attributes; `post["likes"]` and `post.get("location", "—")` still
+    work for code written against the old post dicts.
+    """
+
+    platform: str
+    text: str
+    likes: int
+    location: Optional[str] = None
+    ts: int = 0
+    id: Optional[str] = None
+
+    @classmethod
+    def make(cls, platform: str, text: str, likes: int, location: Optional[str] = None, ts: Any = 0,
+             id: Optional[str] = None) -> "Post":
+        return cls(as_platform(platform), text, int(likes), as_location(location), to_epoch(ts), id)
+
+    @classmethod
+    def from_dict(cls, post: dict) -> "Post":
+        ts = post.get("ts") or post.get("created_at") or post.get("scraped_at")
+        return cls.make(post["platform"], post["text"], post["likes"], post.get("location"), ts, post.get("id"))
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+    def as_dict(self) -> dict:
+        return {k: v for k, v in zip(self._fields, self) if v is not None}
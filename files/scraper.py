@@ -0,0 +1,281 @@
+"""
+Hyper-Local Food Trend Agent — Scraper
+Per-platform adapters on a pooled, concurrent fetch engine | posts are yielded one at a time
+"""
+
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator, Optional
+from urllib.parse import quote, urlsplit
+
+import numpy as np
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from records import Platform, Post
+
+MOCK_POSTS = (
+    Post.make("instagram", "Obsessed with this truffle butter pasta at La Nonna! #food #truffle #pasta #foodie", 1240, "Downtown", id="mock-01"),
+    Post.make("instagram", "Birria tacos are EVERYTHING right now 🔥 #birria #tacos #mexicanfood", 3400, "Eastside", id="mock-02"),
+    Post.make("instagram", "Korean corn dogs > everything. Change my mind. #koreancorndog #streetfood", 2100, "Koreatown", id="mock-03"),
+    Post.make("instagram", "Smash burgers with wagyu beef — this weekend's obsession #wagyu #smashburger", 1870, "Westside", id="mock-04"),
+    Post.make("instagram", "Can't stop thinking about that miso caramel croissant #croissant #fusion #bakery", 4500, "Northside", id="mock-05"),
+    Post.make("twitter", "birria tacos > all tacos. fight me", 890, "City Center", id="mock-06"),
+    Post.make("twitter", "every restaurant needs a smash burger option. it's the law.", 560, "Westside", id="mock-07"),
+    Post.make("twitter", "miso + caramel is the combo i didn't know i needed", 1200, "Northside", id="mock-08"),
+    Post.make("tiktok", "Making viral Dubai chocolate at home #dubai #chocolate #viral #foodtok", 45000, "Suburbs", id="mock-09"),
+    Post.make("tiktok", "Birria ramen fusion — the collab nobody asked for but everyone needed 🔥", 22000, "Eastside", id="mock-10"),
+    Post.make("tiktok", "smash burger tutorial blew up 🍔 #smashburger #burger #foodtok", 31000, "Westside", id="mock-11"),
+    Post.make("tiktok", "truffle everything is back. truffle fries, truffle pasta, truffle butter #truffle", 18000, "Downtown", id="mock-12"),
+    Post.make("yelp", "The wagyu smash burger was incredible. Worth every penny.", 45, "Westside", id="mock-13"),
+    Post.make("yelp", "Birria tacos — crispy, cheesy, and the consommé was perfect for dipping.", 67, "Eastside", id="mock-14"),
+    Post.make("yelp", "Dubai chocolate dessert — unique and absolutely delicious.", 89, "Suburbs", id="mock-15"),
+)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PLATFORM ADAPTERS
+# ─────────────────────────────────────────────────────────────────────────────
+
+_COUNT_RE = re.compile(r"([\d.,]+)\s*([kKmM]?)")
+
+def parse_count(raw: str) -> int:
+    m = _COUNT_RE.search(raw or "")
+    if not m:
+        return 0
+    value = float(m.group(1).replace(",", ""))
+    return int(value * {"k": 1_000, "m": 1_000_000}.get(m.group(2).lower(), 1))
+
+class PlatformAdapter:
+    """Turns one platform's location feed page into post records.
+
+    A post's id is "<platform>:<value>" from the first of `id_attrs` its
+    item element carries; with none, the post has no id.
+    """
+
+    platform = ""
+    item_selector = "article"
+    text_selector = "p"
+    likes_selector = ".likes"
+    id_attrs = ("data-id", "id")
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+
+    def url(self, location: str) -> str:
+        return f"{self.base_url}/{quote(location)}"
+
+    def parse(self, html: str, location: str, ts: int = 0) -> list[Post]:
+        posts = []
+        for item in BeautifulSoup(html, "html.parser").select(self.item_selector):
+            text = item.select_one(self.text_selector)
+            if text is None:
+                continue
+            likes = item.select_one(self.likes_selector)
+            source_id = next((item[a] for a in self.id_attrs if item.get(a)), None)
+            posts.append(Post.make(
+                self.platform,
+                text.get_text(" ", strip=True),
+                parse_count(likes.get_text() if likes else ""),
+                item.get("data-location") or location,
+                ts,
+                f"{self.platform}:{source_id}" if source_id else None,
+            ))
+        return posts
+
+class InstagramAdapter(PlatformAdapter):
+    platform = Platform.INSTAGRAM
+    item_selector = "article"
+    text_selector = ".caption"
+    likes_selector = ".likes"
+    id_attrs = ("data-shortcode", "data-id", "id")
+
+class TikTokAdapter(PlatformAdapter):
+    platform = Platform.TIKTOK
+    item_selector = "div.video-card"
+    text_selector = ".desc"
+    likes_selector = ".like-count"
+    id_attrs = ("data-video-id", "data-id", "id")
+
+class TwitterAdapter(PlatformAdapter):
+    platform = Platform.TWITTER
+    item_selector = "article.tweet"
+    text_selector = ".tweet-text"
+    likes_selector = ".like-count"
+    id_attrs = ("data-tweet-id", "data-id", "id")
+
+class YelpAdapter(PlatformAdapter):
+    platform = Platform.YELP
+    item_selector = "li.review"
+    text_selector = "p.comment"
+    likes_selector = ".useful-count"
+    id_attrs = ("data-review-id", "data-id", "id")
+
+ADAPTERS = {a.platform: a for a in (InstagramAdapter, TikTokAdapter, TwitterAdapter, YelpAdapter)}
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SCRAPE ENGINE
+# ─────────────────────────────────────────────────────────────────────────────
+
+class ScrapeEngine:
+    """Runs adapters on a thread pool sharing one pooled HTTP session.
+
+    Each host gets at most `per_host` requests in flight; transient failures
+    (connection errors, timeouts, 429 and 5xx) are retried up to `retries`
+    times with exponential backoff. A platform that still fails is recorded
+    in `errors` and contributes no posts rather than failing the scrape;
+    `errors` keeps the latest `max_errors`, since the engine lives as long
+    as the process.
+    """
+
+    RETRY_STATUS = {429, 500, 502, 503, 504}
+
+    def __init__(self, adapters: Iterable[PlatformAdapter], max_workers: int = 8,
+                 per_host: int = 4, retries: int = 2, timeout: float = 10.0, backoff: float = 0.25,
+                 max_errors: int = 100):
+        self.adapters = list(adapters)
+        self.per_host = per_host
+        self.retries = retries
+        self.timeout = timeout
+        self.backoff = backoff
+        self.errors: deque[str] = deque(maxlen=max_errors)
+        self.session = requests.Session()
+        pool = HTTPAdapter(pool_connections=max(len(self.adapters), 1), pool_maxsize=max_workers)
+        self.session.mount("http://", pool)
+        self.session.mount("https://", pool)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape")
+        self._host_limits: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host_limit(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_limits[host]
+
+    def _get(self, url: str) -> str:
+        for attempt in range(self.retries + 1):
+            try:
+                with self._host_limit(url):
+                    resp = self.session.get(url, timeout=self.timeout)
+                if resp.status_code not in self.RETRY_STATUS:
+                    resp.raise_for_status()
+                    return resp.text
+                error = requests.HTTPError(f"{resp.status_code} for {url}", response=resp)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            if attempt < self.retries:
+                time.sleep(self.backoff * 2 ** attempt)
+        raise error
+
+    def _fetch(self, adapter: PlatformAdapter, location: str) -> list[Post]:
+        html = self._get(adapter.url(location))
+        return adapter.parse(html, location, int(time.time()))
+
+    def iter_posts(self, locations: Iterable[str], platforms: Optional[Iterable[str]] = None) -> Iterator[Post]:
+        wanted = set(platforms) if platforms is not None else None
+        futures = {
+            self._executor.submit(self._fetch, adapter, loc): (adapter.platform, loc)
+            for loc in locations for adapter in self.adapters
+            if wanted is None or adapter.platform in wanted
+        }
+        for future in as_completed(futures):
+            try:
+                yield from future.result()
+            except requests.RequestException as e:
+                platform, loc = futures[future]
+                with self._lock:
+                    self.errors.append(f"{platform} @ {loc}: {e}")
+
+    def scrape(self, location: str) -> list[Post]:
+        return list(self.iter_posts([location]))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+def engine_from_env() -> Optional[ScrapeEngine]:
+    # e.g. FOOD_AGENT_TIKTOK_URL=https://feeds.internal/tiktok
+    adapters = [cls(url) for name, cls in ADAPTERS.items()
+                if (url := os.environ.get(f"FOOD_AGENT_{name.upper()}_URL"))]
+    if not adapters:
+        return None
+    return ScrapeEngine(
+        adapters,
+        max_workers=int(os.environ.get("FOOD_AGENT_SCRAPE_WORKERS", 8)),
+        per_host=int(os.environ.get("FOOD_AGENT_SCRAPE_PER_HOST", 4)),
+        retries=int(os.environ.get("FOOD_AGENT_SCRAPE_RETRIES", 2)),
+        timeout=float(os.environ.get("FOOD_AGENT_SCRAPE_TIMEOUT", 10)),
+    )
+
+# ─────────────────────────────────────────────────────────────────────────────
+# MOCK SOURCE
+# ─────────────────────────────────────────────────────────────────────────────
+
+class MockSource:
+    """Serves MOCK_POSTS with jittered likes when no platform feed is configured.
+
+    The base records are never touched: each scrape draws one vector of
+    jitter and builds fresh records from it. With a `seed`, a location
+    always gets the same jitter, so demo and load-test runs repeat exactly;
+    without one every scrape draws anew. Holds no mutable state, so
+    sessions can share it across threads.
+    """
+
+    def __init__(self, posts: Iterable[Post] = MOCK_POSTS, seed: Optional[int] = None,
+                 jitter: tuple[int, int] = (-200, 600)):
+        self.posts = tuple(posts)
+        self.seed = seed
+        self.jitter = jitter
+        self._likes = np.array([p.likes for p in self.posts], dtype=np.int64)
+
+    def select(self, location: str) -> np.ndarray:
+        """Indices of the posts whose location contains `location`, or all of them if none do."""
+        if location and location != "All":
+            needle = location.lower()
+            local = [i for i, p in enumerate(self.posts) if needle in (p.location or "").lower()]
+            if local:
+                return np.array(local)
+        return np.arange(len(self.posts))
+
+    def _rng(self, location: str) -> np.random.Generator:
+        if self.seed is None:
+            return np.random.default_rng()
+        return np.random.default_rng([self.seed, *location.encode()])
+
+    def iter_posts(self, locations: Iterable[str], platforms: Optional[Iterable[str]] = None) -> Iterator[Post]:
+        low, high = self.jitter
+        wanted = set(platforms) if platforms is not None else None
+        for location in locations:
+            idx = self.select(location)
+            likes = (self._likes[idx] + self._rng(location).integers(low, high + 1, len(idx))).tolist()
+            now = int(time.time())
+            for i, n in zip(idx.tolist(), likes):
+                p = self.posts[i]
+                if wanted is None or p.platform in wanted:
+                    yield Post(p.platform, p.text, n, p.location, p.ts or now, p.id)
+
+def mock_source_from_env() -> MockSource:
+    seed = os.environ.get("FOOD_AGENT_MOCK_SEED")
+    return MockSource(seed=int(seed) if seed else None)
+
+# Built once per process so pooled connections survive Streamlit reruns.
+# Either source yields Post records from iter_posts(locations).
+_ENGINE = engine_from_env()
+_SOURCE = _ENGINE or mock_source_from_env()
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ENTRY POINTS
+# ─────────────────────────────────────────────────────────────────────────────
+
+def iter_local_trends(location: Optional[str] = None, platforms: Optional[Iterable[str]] = None) -> Iterator[Post]:
+    return _SOURCE.iter_posts([location or "All"], platforms)
+
+def scrape_local_trends(location: Optional[str] = None, platforms: Optional[Iterable[str]] = None) -> list[Post]:
+    """One uncached scrape; the app and batch CLI go through pipeline.SCRAPE_CACHE instead."""
+    return list(iter_local_trends(location, platforms))
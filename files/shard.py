@@ -0,0 +1,114 @@
+"""
+Hyper-Local Food Trend Agent — Sharded Analysis
+Posts partitioned by location or hash | per-process partial scores, merged associatively
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from itertools import islice
+from typing import Iterable, NamedTuple, Optional
+
+from matcher import TermMatcher
+from records import Post
+from sketch import HeavyHitters
+from trends import FOOD_MATCHER, TrendAccumulator, TrendVelocity, trend_report
+
+SHARD_BY = ("location", "hash")
+
+# Workers receive (global index, text, likes, timestamp) rows instead of the
+# Post records, which keeps pickling off the critical path.
+Row = tuple[int, str, int, int]
+
+
+class Partial(NamedTuple):
+    """A shard's plain state; the matcher stays behind in the worker."""
+
+    scores: dict[str, int]
+    first: dict[str, int]  # term -> global index of the first post that scored it
+    posts_seen: int
+    velocity: Optional[TrendVelocity]
+    sketch: Optional[HeavyHitters]
+
+
+def partition(posts: Iterable[Post], shards: int, by: str = "location") -> list[list[Row]]:
+    """Split posts into `shards` row lists.
+
+    By location, whole locations go to the least-loaded shard, largest first,
+    so a city's posts stay together. By hash, each post lands on the hash
+    of its text, which str caches, and shards come out near-equal.
+    """
+    if by not in SHARD_BY:
+        raise ValueError(f"shard by one of {SHARD_BY}, got {by!r}")
+    rows: dict[object, list[Row]] = {}
+    for i, post in enumerate(posts):
+        key = (post.location or "—") if by == "location" else hash(post.text) % shards
+        row = (i, post.text, post.likes, post.ts)
+        rows.setdefault(key, []).append(row)
+    if by == "hash":
+        return [rows.get(s, []) for s in range(shards)]
+    out: list[list[Row]] = [[] for _ in range(shards)]
+    for group in sorted(rows.values(), key=len, reverse=True):
+        min(out, key=len).extend(group)
+    for shard in out:
+        shard.sort()
+    return out
+
+
+_MATCHERS: dict[tuple, TermMatcher] = {}
+
+def _analyze_shard(rows: list[Row], terms: tuple, sketch: Optional[tuple], velocity: bool = False) -> Partial:
+    matcher = _MATCHERS.get(terms)
+    if matcher is None:
+        matcher = _MATCHERS[terms] = TermMatcher(terms)
+    acc = TrendAccumulator(matcher, velocity=TrendVelocity() if velocity else None,
+                           sketch=HeavyHitters(*sketch) if sketch else None)
+    scores, first = acc.scores, {}
+    for i, text, likes, ts in rows:
+        seen = len(scores)
+        acc.add(Post("", text, likes, None, ts))
+        if len(scores) != seen:
+            for term in islice(reversed(scores), len(scores) - seen):
+                first[term] = i
+    return Partial(scores, first, acc.posts_seen, acc.velocity, acc.sketch)
+
+
+def merge_partials(a: Partial, b: Partial) -> Partial:
+    """Fold `b` into `a` (whose dicts are reused); associative like TrendAccumulator.merge."""
+    scores, first = a.scores, a.first
+    for term, likes in b.scores.items():
+        scores[term] = scores.get(term, 0) + likes
+    for term, i in b.first.items():
+        if i < first.get(term, i + 1):
+            first[term] = i
+    velocity = a.velocity.merge(b.velocity) if a.velocity is not None and b.velocity is not None else None
+    sketch = a.sketch.merge(b.sketch) if a.sketch is not None and b.sketch is not None else None
+    return Partial(scores, first, a.posts_seen + b.posts_seen, velocity, sketch)
+
+
+def analyze_trends_sharded(posts: Iterable[Post], workers: Optional[int] = None, by: str = "location",
+                           matcher: TermMatcher = FOOD_MATCHER,
+                           sketch: Optional[tuple[int, int, int]] = None, velocity: bool = False) -> dict:
+    """`analyze_trends` over a process pool; the report matches the single-process one.
+
+    `sketch` is (k, width, depth) for per-shard heavy-hitter counters; those
+    merge too, with error bounds that add across shards. With `velocity`,
+    shards also keep windowed counters, for posts that span several days.
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = partition(posts, workers, by)
+    terms = tuple(matcher.terms)
+    if workers == 1:
+        partials = [_analyze_shard(shards[0], terms, sketch, velocity)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            partials = list(pool.map(_analyze_shard, shards, [terms] * workers, [sketch] * workers,
+                                     [velocity] * workers))
+    merged = reduce(merge_partials, partials)
+    if merged.sketch is not None:
+        acc = TrendAccumulator(matcher, velocity=merged.velocity, sketch=merged.sketch)
+        acc.posts_seen = merged.posts_seen
+        return acc.snapshot()
+    # Ties keep the order a single pass would have given: first-seen post.
+    scores = {term: merged.scores[term] for term in sorted(merged.scores, key=merged.first.__getitem__)}
+    return trend_report(scores, merged.posts_seen, merged.velocity)
@@ -0,0 +1,203 @@
+"""
+Hyper-Local Food Trend Agent — Heavy Hitters
+Count-Min Sketch + Space-Saving top-k | like-weighted term scores in fixed memory
+"""
+
+import hashlib
+import heapq
+import math
+from array import array
+from typing import NamedTuple
+
+
+class CountMinSketch:
+    """Fixed-size table of weighted counters; estimates never undercount.
+
+    With total weight N, `estimate(x) <= true(x) + epsilon * N` holds with
+    probability at least `1 - delta`, where epsilon = e / width and
+    delta = e ** -depth. Row hashes come from one blake2b digest (double
+    hashing), so sketches built in different processes line up.
+    """
+
+    __slots__ = ("width", "depth", "total", "_rows")
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._rows = [array("q", bytes(8 * width)) for _ in range(depth)]
+
+    @property
+    def epsilon(self) -> float:
+        return math.e / self.width
+
+    @property
+    def delta(self) -> float:
+        return math.exp(-self.depth)
+
+    def _cells(self, key: str) -> list[int]:
+        h = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=16).digest(), "little")
+        h1, h2, width = h >> 64, (h & 0xFFFFFFFFFFFFFFFF) | 1, self.width
+        return [(h1 + i * h2) % width for i in range(self.depth)]
+
+    def add(self, key: str, weight: int = 1) -> None:
+        self.total += weight
+        for row, cell in zip(self._rows, self._cells(key)):
+            row[cell] += weight
+
+    def estimate(self, key: str) -> int:
+        return min(row[cell] for row, cell in zip(self._rows, self._cells(key)))
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError(f"cannot merge a {other.depth}x{other.width} sketch into {self.depth}x{self.width}")
+        for row, orow in zip(self._rows, other._rows):
+            for cell, count in enumerate(orow):
+                if count:
+                    row[cell] += count
+        self.total += other.total
+        return self
+
+    def nbytes(self) -> int:
+        return 8 * self.width * self.depth
+
+
+class SpaceSaving:
+    """Weighted Space-Saving summary holding at most `k` counters.
+
+    Each tracked key has a count and the error it inherited on entry, with
+    `count - error <= true <= count`. Any key whose true weight exceeds
+    N / k is guaranteed to be tracked. The minimum counter is found through
+    a lazily pruned heap of (count, key) entries. Weights may be zero or
+    negative: tracked keys and free slots take them as-is, but once full
+    a non-positive weight can't lift an untracked key into the top k, so
+    it is dropped rather than evicting anything.
+    """
+
+    __slots__ = ("k", "counters", "_heap")
+
+    def __init__(self, k: int = 256):
+        self.k = k
+        self.counters: dict[str, list[int]] = {}
+        self._heap: list[tuple[int, str]] = []
+
+    def _min(self) -> tuple[int, str]:
+        heap, counters = self._heap, self.counters
+        while True:
+            count, key = heap[0]
+            entry = counters.get(key)
+            if entry is not None and entry[0] == count:
+                return count, key
+            heapq.heappop(heap)
+
+    def add(self, key: str, weight: int = 1) -> None:
+        counters = self.counters
+        entry = counters.get(key)
+        if entry is not None:
+            entry[0] += weight
+        elif len(counters) < self.k:
+            entry = counters[key] = [weight, 0]
+        elif weight <= 0:
+            return
+        else:
+            floor, evicted = self._min()
+            del counters[evicted]
+            entry = counters[key] = [floor + weight, floor]
+        heapq.heappush(self._heap, (entry[0], key))
+        if len(self._heap) > 8 * self.k:
+            self._heap = [(count, key) for key, (count, _) in counters.items()]
+            heapq.heapify(self._heap)
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """Mergeable-summaries union: a key missing from a full summary is
+        charged that summary's minimum, then the k largest counts survive."""
+        def floor(summary: "SpaceSaving") -> int:
+            return min(c for c, _ in summary.counters.values()) if len(summary.counters) >= summary.k else 0
+
+        mine, theirs = floor(self), floor(other)
+        merged = {}
+        for key in self.counters.keys() | other.counters.keys():
+            c1, e1 = self.counters.get(key, (mine, mine))
+            c2, e2 = other.counters.get(key, (theirs, theirs))
+            merged[key] = [c1 + c2, e1 + e2]
+        keep = heapq.nlargest(self.k, merged, key=lambda key: merged[key][0])
+        self.counters = {key: merged[key] for key in keep}
+        self._heap = [(count, key) for key, (count, _) in self.counters.items()]
+        heapq.heapify(self._heap)
+        return self
+
+    def nbytes(self) -> int:
+        # Counter slots plus the heap's entries at their current size.
+        return 120 * len(self.counters) + 72 * len(self._heap)
+
+
+class ScoreBound(NamedTuple):
+    low: int
+    high: int
+
+
+class HeavyHitters:
+    """Approximate stand-in for an exact `{term: likes}` dict.
+
+    Space-Saving picks which terms to keep; each reported score is the
+    tighter of its Space-Saving count and the Count-Min estimate, with a
+    guaranteed floor of `count - error`. Zero and negative likes are summed
+    like the exact dict does, so while the vocabulary fits in k the scores
+    match it exactly. The Count-Min sketch only takes positive weight, which
+    keeps its estimate an upper bound.
+    """
+
+    __slots__ = ("cms", "top", "_pending", "_flush_at")
+
+    def __init__(self, k: int = 256, width: int = 2048, depth: int = 4, buffer: int = 4096):
+        self.cms = CountMinSketch(width, depth)
+        self.top = SpaceSaving(k)
+        # Repeat terms are summed in a small bounded buffer before hashing;
+        # skewed streams hit the sketch once per distinct term per flush.
+        self._pending: dict[str, int] = {}
+        self._flush_at = buffer
+
+    def add(self, term: str, likes: int) -> None:
+        pending = self._pending
+        pending[term] = pending.get(term, 0) + likes
+        if len(pending) >= self._flush_at:
+            self.flush()
+
+    def flush(self) -> None:
+        cms, top = self.cms, self.top
+        for term, likes in self._pending.items():
+            if likes > 0:
+                cms.add(term, likes)
+            top.add(term, likes)
+        self._pending.clear()
+
+    def merge(self, other: "HeavyHitters") -> "HeavyHitters":
+        self.flush()
+        other.flush()
+        self.cms.merge(other.cms)
+        self.top.merge(other.top)
+        return self
+
+    def bounds(self) -> dict[str, ScoreBound]:
+        self.flush()
+        cms = self.cms
+        return {term: ScoreBound(count - error, min(count, cms.estimate(term)))
+                for term, (count, error) in self.top.counters.items()}
+
+    def scores(self) -> dict[str, int]:
+        return {term: bound.high for term, bound in self.bounds().items()}
+
+    def error_report(self) -> dict:
+        """Global guarantees for the current stream, in likes."""
+        self.flush()
+        cms, top = self.cms, self.top
+        return {
+            "total_likes": cms.total,
+            "cms_overcount": math.ceil(cms.epsilon * cms.total),
+            "cms_confidence": 1 - cms.delta,
+            "guaranteed_above": cms.total // top.k,
+            "tracked_terms": len(top.counters),
+        }
+
+    def nbytes(self) -> int:
+        return self.cms.nbytes() + self.top.nbytes() + 100 * self._flush_at
@@ -0,0 +1,189 @@
+"""
+Hyper-Local Food Trend Agent — Columnar Post Store
+Dictionary-encoded columns | vectorized group-by sums and memoized aggregates
+"""
+
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
+
+from matcher import TermMatcher
+from records import Post, as_platform
+from trends import FOOD_MATCHER
+
+GROUP_KEYS = ("platform", "location", "term")
+# "scraped_at" holds each post's epoch-second `ts`; the name is kept for archived segments.
+# Code columns cap the distinct labels a store can hold: 256 platforms and
+# ~4.3 billion locations. Archived segments keep whatever dtype they were
+# written with, since .npy files carry their own.
+COLUMN_TYPES = {"platform": ("B", np.uint8), "location": ("I", np.uint32),
+                "likes": ("q", np.int64), "scraped_at": ("q", np.int64)}
+
+
+class PostStore:
+    """Posts held as parallel columns instead of one dict per post.
+
+    `platform` and `location` are stored as small integer codes into
+    per-store dictionaries, likes and timestamps as int64 and text as
+    interned strings. Columns live either as growable buffers (while
+    appending) or as NumPy arrays (once read), never both at once.
+    """
+
+    def __init__(self):
+        self.platforms: list[str] = []
+        self.locations: list[str] = []
+        self.texts: list[str] = []
+        self._codes = {"platform": {}, "location": {}}
+        self._buffers: Optional[dict] = {name: array(tc) for name, (tc, _) in COLUMN_TYPES.items()}
+        self._columns: Optional[dict] = None
+        self._term_hits: dict[int, tuple] = {}
+
+    @classmethod
+    def from_posts(cls, posts: Iterable[Post]) -> "PostStore":
+        store = cls()
+        store.extend(posts)
+        return store
+
+    def _encode(self, key: str, value: str, labels: list) -> int:
+        codes = self._codes[key]
+        code = codes.get(value)
+        if code is None:
+            if len(labels) > np.iinfo(COLUMN_TYPES[key][1]).max:
+                raise ValueError(f"PostStore holds at most {len(labels):,} distinct {key}s "
+                                 f"({COLUMN_TYPES[key][1].__name__} codes); cannot add {value!r}")
+            code = codes[value] = len(labels)
+            labels.append(sys.intern(str(value)))
+        return code
+
+    def _thaw(self) -> dict:
+        if self._buffers is None:
+            self._buffers = {name: array(COLUMN_TYPES[name][0], col.tobytes())
+                             for name, col in self._columns.items()}
+            self._columns = None
+        return self._buffers
+
+    def append(self, post: Post) -> None:
+        buffers = self._thaw()
+        buffers["platform"].append(self._encode("platform", post.platform, self.platforms))
+        buffers["location"].append(self._encode("location", post.location or "—", self.locations))
+        buffers["likes"].append(post.likes)
+        buffers["scraped_at"].append(post.ts)
+        self.texts.append(sys.intern(post.text))
+        self._term_hits.clear()
+
+    def extend(self, posts: Iterable[Post]) -> None:
+        for post in posts:
+            self.append(post)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __getitem__(self, i: int) -> Post:
+        cols = self._buffers or self._columns
+        return Post(as_platform(self.platforms[cols["platform"][i]]), self.texts[i], int(cols["likes"][i]),
+                    self.locations[cols["location"][i]], int(cols["scraped_at"][i]))
+
+    @property
+    def columns(self) -> dict:
+        if self._columns is None:
+            self._columns = {name: np.frombuffer(self._buffers[name], dtype=dtype).copy()
+                             for name, (_, dtype) in COLUMN_TYPES.items()}
+            self._buffers = None
+        return self._columns
+
+    def nbytes(self) -> int:
+        return sum(col.nbytes for col in self.columns.values()) + 8 * len(self.texts)
+
+    def term_hits(self, matcher: TermMatcher = FOOD_MATCHER) -> tuple[np.ndarray, np.ndarray]:
+        # (post row, term id) pairs; text matching runs once per store and matcher.
+        hits = self._term_hits.get(id(matcher))
+        if hits is None:
+            rows, term_ids = array("q"), array("q")
+            for row, text in enumerate(self.texts):
+                for term_id in matcher.find_ids(text.lower()):
+                    rows.append(row)
+                    term_ids.append(term_id)
+            hits = (np.frombuffer(rows, dtype=np.int64), np.frombuffer(term_ids, dtype=np.int64), matcher)
+            self._term_hits[id(matcher)] = hits
+        return hits[0], hits[1]
+
+    def sum_by(self, *keys: str, matcher: TermMatcher = FOOD_MATCHER) -> dict:
+        """Like totals grouped by any of platform, location and term.
+
+        Single keys give `{label: total}`, several give `{(label, ...): total}`.
+        Groups that no post falls into are omitted.
+        """
+        unknown = set(keys) - set(GROUP_KEYS)
+        if unknown or not keys:
+            raise ValueError(f"group keys must be drawn from {GROUP_KEYS}, got {keys}")
+        cols = self.columns
+        rows = slice(None)
+        term_ids = None
+        if "term" in keys:
+            rows, term_ids = self.term_hits(matcher)
+        labels = {"platform": self.platforms, "location": self.locations, "term": matcher.terms}
+        codes = [term_ids if key == "term" else cols[key][rows].astype(np.int64) for key in keys]
+        dims = tuple(max(len(labels[key]), 1) for key in keys)
+        flat = np.ravel_multi_index(codes, dims) if codes[0].size else np.zeros(0, dtype=np.int64)
+        size = int(np.prod(dims))
+        totals = np.bincount(flat, weights=cols["likes"][rows], minlength=size)
+        present = np.flatnonzero(np.bincount(flat, minlength=size))
+        out = {}
+        for group in present:
+            idx = np.unravel_index(group, dims)
+            label = tuple(labels[key][i] for key, i in zip(keys, idx))
+            out[label if len(keys) > 1 else label[0]] = int(round(totals[group]))
+        return out
+
+# ─────────────────────────────────────────────────────────────────────────────
+# AGGREGATION ENGINE
+# ─────────────────────────────────────────────────────────────────────────────
+
+class Aggregates(NamedTuple):
+    posts: int
+    total_likes: int
+    platform: dict
+    location: dict
+    platform_location: dict
+
+def aggregate(store: PostStore) -> Aggregates:
+    """Platform, location and platform x location totals from one bincount pass."""
+    cols = store.columns
+    n_loc = max(len(store.locations), 1)
+    dims = (max(len(store.platforms), 1), n_loc)
+    flat = cols["platform"].astype(np.int64) * n_loc + cols["location"]
+    likes = np.bincount(flat, weights=cols["likes"], minlength=dims[0] * n_loc).reshape(dims)
+    counts = np.bincount(flat, minlength=dims[0] * n_loc).reshape(dims)
+    return Aggregates(
+        posts=len(store),
+        total_likes=int(cols["likes"].sum()),
+        platform={p: int(round(v)) for p, v in zip(store.platforms, likes.sum(axis=1))},
+        location={loc: int(round(v)) for loc, v in zip(store.locations, likes.sum(axis=0))},
+        platform_location={(p, loc): int(round(likes[i, j]))
+                           for i, p in enumerate(store.platforms)
+                           for j, loc in enumerate(store.locations) if counts[i, j]},
+    )
+
+_AGGREGATES: "OrderedDict[int, tuple[list, Aggregates]]" = OrderedDict()
+_AGGREGATES_LOCK = threading.Lock()
+_AGGREGATES_MAX = 16
+
+def aggregate_posts(posts: list[Post]) -> Aggregates:
+    # Memoized on the identity of the batch: a Streamlit rerun hands back the
+    # same list from session_state, so widgets never rescan it.
+    key = id(posts)
+    with _AGGREGATES_LOCK:
+        hit = _AGGREGATES.get(key)
+        if hit is not None and hit[0] is posts:
+            _AGGREGATES.move_to_end(key)
+            return hit[1]
+    result = aggregate(PostStore.from_posts(posts))
+    with _AGGREGATES_LOCK:
+        _AGGREGATES[key] = (posts, result)
+        if len(_AGGREGATES) > _AGGREGATES_MAX:
+            _AGGREGATES.popitem(last=False)
+    return result
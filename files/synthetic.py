@@ -0,0 +1,160 @@
+"""
+Hyper-Local Food Trend Agent — Synthetic Corpus
+Seeded post generator | platform mix, skewed locations, Zipf term frequencies and heavy-tailed likes
+Run: python synthetic.py --posts 1000000 --seed 7 --out corpus.jsonl
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Iterator, Optional
+
+import numpy as np
+
+from records import Post, as_location, as_platform
+from trends import FOOD_TERMS
+
+# Share of posts and log-normal (mu, sigma) of likes per platform: a median
+# TikTok post gets ~660 likes and one in a thousand clears 300k.
+PLATFORM_MIX = {"tiktok": 0.38, "instagram": 0.32, "twitter": 0.18, "yelp": 0.12}
+LIKES_LOGNORMAL = {"tiktok": (6.5, 2.0), "instagram": (5.5, 1.7), "twitter": (4.0, 1.8), "yelp": (2.0, 1.1)}
+
+LOCATIONS = ["Downtown", "Eastside", "Westside", "Northside", "Koreatown", "Suburbs", "City Center"]
+
+_PREFIXES = ["spicy", "crispy", "smoked", "matcha", "ube", "hot honey", "brown butter", "yuzu",
+             "black sesame", "gochujang", "pistachio", "nashville", "tajin", "chili crisp", "mochi"]
+_BASES = ["bao", "pizza", "wings", "latte", "cookie", "donut", "noodles", "dumplings", "sando",
+          "cheesecake", "toast", "fries", "bowl", "roll", "churros", "tteokbokki", "empanadas"]
+
+_OPENERS = ["obsessed with the", "can't stop thinking about the", "finally tried the", "the", "ok the",
+            "you need the", "weekend plans: the", "lines around the block for the", "first time having the"]
+_JOINERS = ["and the", "plus the", "with a side of", "then the", "and honestly the"]
+_CLOSERS = ["here", "at this spot", "this weekend", "downtown", "🔥", "10/10", "worth the wait",
+            "never going back", "no notes", "🤤", "at the night market", ""]
+
+# Every chunk draws a full CHUNK of values from its own (seed, chunk) stream,
+# so any chunk regenerates on its own and a smaller corpus is a prefix of a
+# larger one with the same seed.
+CHUNK = 65_536
+
+
+def vocabulary(size: int, seed: int = 0, known: list[str] = FOOD_TERMS) -> list[str]:
+    """`known` terms first, topped up with invented dish names; rank order is popularity order."""
+    rng = np.random.default_rng(seed)
+    terms = list(dict.fromkeys(known))
+    invented = [f"{p} {b}" for p in _PREFIXES for b in _BASES if f"{p} {b}" not in terms]
+    invented += [f"{p} {q} {b}" for p in _PREFIXES for q in _PREFIXES if p != q for b in _BASES]
+    order = rng.permutation(len(invented))
+    terms += [invented[i] for i in order[:max(0, size - len(terms))]]
+    if len(terms) < size:
+        # Combos ("spicy bao fries") only past ~3,800 terms, so smaller vocabularies keep their draw.
+        combos = [f"{p} {b} {c}" for p in _PREFIXES for b in _BASES for c in _BASES if b != c]
+        order = rng.permutation(len(combos))
+        terms += [combos[i] for i in order[:size - len(terms)]]
+    return terms
+
+
+def zipf_weights(n: int, s: float) -> np.ndarray:
+    w = 1.0 / np.arange(1, n + 1) ** s
+    return w / w.sum()
+
+
+class SyntheticCorpus:
+    """Deterministic stream of Post records shaped like the scraper's output.
+
+    Terms follow a Zipf(`zipf`) law over `vocabulary` ranked terms, with
+    0–3 per post; locations follow Zipf(`location_zipf`) over `locations`;
+    likes are log-normal per platform. `ts` is spread evenly over
+    the `days` before `end` (default: now), so pass `end` for identical
+    output across runs.
+    """
+
+    def __init__(self, seed: int = 0, vocabulary_size: int = 500, zipf: float = 1.1,
+                 locations: list[str] = LOCATIONS, location_zipf: float = 0.8,
+                 platform_mix: dict[str, float] = PLATFORM_MIX, days: float = 7, end: Optional[float] = None,
+                 hashtag_rate: float = 0.3):
+        self.seed = seed
+        self.terms = vocabulary(vocabulary_size, seed)
+        self.term_p = zipf_weights(len(self.terms), zipf)
+        self.tags = ["#" + t.replace(" ", "") for t in self.terms]
+        self.locations = [as_location(loc) for loc in locations]
+        self.location_p = zipf_weights(len(self.locations), location_zipf)
+        self.platforms = [as_platform(p) for p in platform_mix]
+        mix = np.array(list(platform_mix.values()), dtype=float)
+        self.platform_p = mix / mix.sum()
+        self.likes_mu = np.array([LIKES_LOGNORMAL.get(p, (4.0, 1.5))[0] for p in self.platforms])
+        self.likes_sigma = np.array([LIKES_LOGNORMAL.get(p, (4.0, 1.5))[1] for p in self.platforms])
+        self.end = time.time() if end is None else end
+        self.start = self.end - days * 86400
+        self.hashtag_rate = hashtag_rate
+
+    def chunk(self, number: int, size: int = CHUNK) -> list[Post]:
+        rng = np.random.default_rng([self.seed, number])
+        size, draw = min(size, CHUNK), CHUNK
+        platform = rng.choice(len(self.platforms), draw, p=self.platform_p)
+        location = rng.choice(len(self.locations), draw, p=self.location_p)
+        likes = np.floor(rng.lognormal(self.likes_mu[platform], self.likes_sigma[platform])).astype(np.int64)
+        created = rng.uniform(self.start, self.end, draw).astype(np.int64)
+        n_terms = np.minimum(rng.poisson(1.2, draw), 3)
+        terms = rng.choice(len(self.terms), (draw, 3), p=self.term_p)
+        hashtag = (rng.random(draw) < self.hashtag_rate).tolist()
+        opener = rng.integers(len(_OPENERS), size=draw).tolist()
+        joiner = rng.integers(len(_JOINERS), size=draw).tolist()
+        closer = rng.integers(len(_CLOSERS), size=draw).tolist()
+        likes, created = likes.tolist(), created.tolist()
+
+        platforms, locations, names, tags = self.platforms, self.locations, self.terms, self.tags
+        first = number * CHUNK
+        posts = []
+        rows = zip(platform[:size].tolist(), location[:size].tolist(), n_terms[:size].tolist(), terms[:size].tolist())
+        for i, (p, loc, k, row) in enumerate(rows):
+            if k == 0:
+                text = f"{_OPENERS[opener[i]]} vibes {_CLOSERS[closer[i]]}"
+            else:
+                text = f"{_OPENERS[opener[i]]} {names[row[0]]}"
+                for t in row[1:k]:
+                    text += f" {_JOINERS[joiner[i]]} {names[t]}"
+                text += f" {_CLOSERS[closer[i]]}"
+                if hashtag[i]:
+                    text += " " + " ".join(tags[t] for t in row[:k])
+            posts.append(Post(platforms[p], text.rstrip(), likes[i], locations[loc], created[i], f"syn-{self.seed}-{first + i}"))
+        return posts
+
+    def chunks(self, n: int) -> Iterator[list[Post]]:
+        for number in range(-(-n // CHUNK)):
+            yield self.chunk(number, min(CHUNK, n - number * CHUNK))
+
+    def posts(self, n: int) -> Iterator[Post]:
+        for chunk in self.chunks(n):
+            yield from chunk
+
+
+def synthetic_corpus(n: int, seed: int = 0, **kwargs) -> list[Post]:
+    return list(SyntheticCorpus(seed, **kwargs).posts(n))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Write a seeded synthetic post corpus as JSON lines.")
+    parser.add_argument("--posts", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--vocabulary", type=int, default=500)
+    parser.add_argument("--zipf", type=float, default=1.1)
+    parser.add_argument("--days", type=float, default=7)
+    parser.add_argument("--end", type=float, help="epoch seconds of the newest post (default: now)")
+    parser.add_argument("--out", default="-", help="output file, or - for stdout")
+    args = parser.parse_args(argv)
+
+    corpus = SyntheticCorpus(args.seed, args.vocabulary, args.zipf, days=args.days, end=args.end)
+    out = sys.stdout if args.out == "-" else open(args.out, "w")
+    try:
+        for chunk in corpus.chunks(args.posts):
+            out.writelines(json.dumps(post.as_dict()) + "\n" for post in chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Hyper-Local Food Trend Agent — Scraper Tests
+Platform adapters and the fetch engine against bench.py's local fake feed server
+Run: python -m pytest -q test_scraper.py
+"""
+
+import pytest
+
+from bench import fake_feed_server
+from scraper import ADAPTERS, Platform, ScrapeEngine
+
+TERMS = ["birria tacos", "smash burger", "dubai chocolate"]
+PAGE = 3
+
+
+@pytest.fixture
+def feed(request):
+    # Parametrize indirectly with a `fail` mapping to inject error statuses.
+    server, base = fake_feed_server(0.0, PAGE, TERMS, getattr(request, "param", None))
+    yield server, base
+    server.shutdown()
+    server.server_close()
+
+
+def make_engine(base: str, **kwargs) -> ScrapeEngine:
+    return ScrapeEngine([cls(f"{base}/{name}") for name, cls in ADAPTERS.items()], backoff=0.0, **kwargs)
+
+
+def test_adapters_parse_every_platform(feed):
+    _, base = feed
+    engine = make_engine(base)
+    try:
+        posts = engine.scrape("West Side")
+    finally:
+        engine.close()
+
+    assert sorted(p.id for p in posts) == sorted(f"{platform}:West Side-{i}" for platform in ADAPTERS for i in range(PAGE))
+    assert {p.platform for p in posts} == set(Platform)
+    for post in posts:
+        assert post.location == "West Side"
+        assert any(term in post.text for term in TERMS)
+        assert post.likes >= 1_000 and post.likes % 100 == 0  # "123.4K" parses to 123400
+        assert post.ts > 0
+    assert not engine.errors
+
+
+@pytest.mark.parametrize("feed", [{"tiktok": [429, 503]}], indirect=True)
+def test_transient_statuses_are_retried(feed):
+    server, base = feed
+    engine = make_engine(base, retries=2)
+    try:
+        posts = engine.scrape("Downtown")
+    finally:
+        engine.close()
+
+    assert server.requests["tiktok"] == 3
+    assert sum(p.platform == "tiktok" for p in posts) == PAGE
+    assert len(posts) == PAGE * len(ADAPTERS)
+    assert not engine.errors
+
+
+@pytest.mark.parametrize("feed", [{"yelp": [500] * 20}], indirect=True)
+def test_failing_platform_is_recorded_not_raised(feed):
+    server, base = feed
+    engine = make_engine(base, retries=1, max_errors=3)
+    try:
+        posts = engine.scrape("Eastside")
+        for _ in range(4):
+            engine.scrape("Eastside")
+    finally:
+        engine.close()
+
+    assert server.requests["yelp"] == 2 * 5
+    assert {p.platform for p in posts} == set(ADAPTERS) - {"yelp"}
+    assert len(posts) == PAGE * (len(ADAPTERS) - 1)
+    assert len(engine.errors) == 3  # bounded: only the latest failures are kept
+    assert all(e.startswith("yelp @ Eastside: 500") for e in engine.errors)
@@ -0,0 +1,188 @@
+"""
+Hyper-Local Food Trend Agent — Tracing
+Nested timing spans with attributes | JSONL export, per-stage histograms and a per-run cProfile hook
+"""
+
+import contextvars
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+_CURRENT: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("food_agent_span", default=None)
+
+
+class Span:
+    """One timed operation. Entering it makes it the parent of spans opened inside.
+
+    Spans that can't wrap a `with` block (a generator that yields to the
+    caller, say) are created without entering and closed with `finish()`.
+    """
+
+    __slots__ = ("tracer", "name", "attrs", "trace_id", "span_id", "parent_id", "start", "duration",
+                 "_t0", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: dict):
+        parent = _CURRENT.get()
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.trace_id = parent.trace_id if parent is not None else uuid.uuid4().hex[:16]
+        self.span_id = uuid.uuid4().hex[:8]
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start = time.time()
+        self.duration: Optional[float] = None
+        self._t0 = time.perf_counter()
+        self._token = None
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def elapsed_ms(self) -> float:
+        return round((time.perf_counter() - self._t0) * 1000, 3)
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self._t0
+        if error is not None:
+            self.attrs["error"] = f"{type(error).__name__}: {error}"
+        self.tracer._record(self)
+
+    def __enter__(self) -> "Span":
+        self._token = _CURRENT.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _CURRENT.reset(self._token)
+        self.finish(exc)
+
+    def to_dict(self) -> dict:
+        return {"trace": self.trace_id, "span": self.span_id, "parent": self.parent_id, "name": self.name,
+                "start": self.start, "ms": round(self.duration * 1000, 3), "attrs": self.attrs}
+
+
+class Tracer:
+    """Keeps the most recent finished spans and groups them into traces.
+
+    When a root span finishes, its whole trace is appended to `export_path`
+    as JSON lines, if one is set. A failed write never fails the traced
+    code; the error is kept in `export_error`.
+    """
+
+    def __init__(self, export_path: Optional[str] = None, max_spans: int = 10_000):
+        self.export_path = export_path
+        self.spans: deque[Span] = deque(maxlen=max_spans)
+        self._open: dict[str, list[Span]] = {}
+        self._lock = threading.Lock()
+        self.export_error: Optional[str] = None
+
+    def span(self, name: str, **attrs) -> Span:
+        return Span(self, name, attrs)
+
+    def _record(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+            trace = self._open.setdefault(span.trace_id, [])
+            trace.append(span)
+            if span.parent_id is not None:
+                return
+            del self._open[span.trace_id]
+        if self.export_path:
+            try:
+                self.export(trace, self.export_path)
+            except OSError as e:
+                self.export_error = f"{type(e).__name__}: {e}"
+
+    def trace(self, trace_id: str) -> list[Span]:
+        with self._lock:
+            return [s for s in self.spans if s.trace_id == trace_id]
+
+    def export(self, spans: Optional[list[Span]] = None, path: Optional[str] = None) -> None:
+        """Append spans (default: all retained) to a JSONL file."""
+        with self._lock:
+            spans = list(self.spans) if spans is None else spans
+        with open(path or self.export_path, "a") as f:
+            f.writelines(json.dumps(s.to_dict(), default=str) + "\n" for s in spans)
+
+    def histograms(self) -> dict[str, dict]:
+        """Per span name: count and p50 / p95 / max / total milliseconds."""
+        with self._lock:
+            by_name: dict[str, list[float]] = {}
+            for s in self.spans:
+                by_name.setdefault(s.name, []).append(s.duration * 1000)
+        out = {}
+        for name, ms in sorted(by_name.items()):
+            ms.sort()
+            p50, p95 = ms[len(ms) // 2], ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+            out[name] = {"count": len(ms), "p50_ms": round(p50, 3), "p95_ms": round(p95, 3),
+                         "max_ms": round(ms[-1], 3), "total_ms": round(sum(ms), 3)}
+        return out
+
+
+TRACER = Tracer(os.environ.get("FOOD_AGENT_TRACE_FILE"))
+
+
+def span(name: str, **attrs) -> Span:
+    return TRACER.span(name, **attrs)
+
+
+def annotate(**attrs) -> None:
+    """Attach attributes to the innermost open span; a no-op outside any span."""
+    current = _CURRENT.get()
+    if current is not None:
+        current.attrs.update(attrs)
+
+
+def traced(name: str) -> Callable:
+    def wrap(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            with TRACER.span(name):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+
+def submit_in_context(pool, fn: Callable, *args):
+    """`pool.submit` that carries the caller's open span into the worker thread."""
+    return pool.submit(contextvars.copy_context().run, fn, *args)
+
+
+@contextmanager
+def profiled(enabled: bool = True, path: Optional[str] = None, top: int = 25) -> Iterator[dict]:
+    """cProfile the block when `enabled`.
+
+    The yielded dict gets a `summary` with the top cumulative-time entries,
+    the `profiler` itself for a later `dump_stats`, and `path` if the raw
+    stats were dumped for snakeviz/pstats (or `error` if that failed).
+    """
+    result: dict = {}
+    if not enabled:
+        yield result
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+        result["summary"] = out.getvalue()
+        result["profiler"] = profiler
+        if path:
+            try:
+                profiler.dump_stats(path)
+                result["path"] = path
+            except OSError as e:
+                result["error"] = f"{type(e).__name__}: {e}"
+        annotate(profile=result.get("path", "inline"))
@@ -0,0 +1,384 @@
+"""
+Hyper-Local Food Trend Agent — Trend Analysis
+Like-weighted term scoring | streaming, incremental and sliding-window analysis of scraped posts
+"""
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Iterable, Mapping, Optional
+
+from index import TermIndex
+from matcher import TermMatcher
+from records import Post
+from sketch import HeavyHitters
+
+FOOD_TERMS = [
+    "birria", "truffle", "wagyu", "smash burger", "miso", "caramel",
+    "croissant", "tacos", "ramen", "korean corn dog", "dubai chocolate",
+    "pasta", "burger", "chocolate", "fusion"
+]
+
+# Compiled once per process so Streamlit reruns don't rebuild the automaton.
+FOOD_MATCHER = TermMatcher(FOOD_TERMS)
+
+
+def post_timestamp(post: Post) -> float:
+    return float(post.ts) if post.ts else time.time()
+
+
+class _TermWindow:
+    __slots__ = ("ring", "head", "sums")
+
+    def __init__(self, size: int, n_spans: int, head: int):
+        self.ring = [0] * size
+        self.head = head
+        self.sums = [0] * n_spans
+
+
+class TrendVelocity:
+    """Sliding 1h / 24h / 7d like counters per term on an hourly ring buffer.
+
+    Each post is an O(1) update to its bucket and to the window sums that
+    cover it. Buckets expire lazily as a term's head advances, so history is
+    never rescanned. Rates are likes per hour; velocity is the 24h rate over
+    the 7d baseline and acceleration the 1h rate over the 24h rate. Both
+    only mean something once the engine has seen posts older than a day
+    (`warm`); until then every term looks like it is rising.
+    """
+
+    SPANS = {"1h": 1, "24h": 24, "7d": 168}
+
+    def __init__(self, bucket_seconds: int = 3600):
+        self.bucket_seconds = bucket_seconds
+        self.spans = tuple(self.SPANS.values())
+        self.size = max(self.spans)
+        self.clock: Optional[int] = None
+        self.first: Optional[int] = None
+        self._terms: dict[str, _TermWindow] = {}
+
+    @property
+    def warm(self) -> bool:
+        return self.first is not None and self.clock - self.first >= self.SPANS["24h"]
+
+    def _advance(self, w: _TermWindow, head: int) -> None:
+        steps = head - w.head
+        if steps <= 0:
+            return
+        if steps >= self.size:
+            w.ring = [0] * self.size
+            w.sums = [0] * len(self.spans)
+        else:
+            ring, sums, size = w.ring, w.sums, self.size
+            for b in range(w.head + 1, head + 1):
+                for i, span in enumerate(self.spans):
+                    sums[i] -= ring[(b - span) % size]
+                ring[b % size] = 0
+        w.head = head
+
+    def add(self, term: str, likes: int, ts: float) -> None:
+        bucket = int(ts // self.bucket_seconds)
+        if self.clock is None or bucket > self.clock:
+            self.clock = bucket
+        if self.first is None or bucket < self.first:
+            self.first = bucket
+        w = self._terms.get(term)
+        if w is None:
+            w = self._terms[term] = _TermWindow(self.size, len(self.spans), bucket)
+        elif bucket > w.head:
+            self._advance(w, bucket)
+        age = w.head - bucket
+        if age >= self.size:
+            return
+        w.ring[bucket % self.size] += likes
+        for i, span in enumerate(self.spans):
+            if age < span:
+                w.sums[i] += likes
+
+    def merge(self, other: "TrendVelocity") -> "TrendVelocity":
+        """Fold in another engine's counters; both are aligned to the later head first."""
+        for term, ow in other._terms.items():
+            w = self._terms.get(term)
+            if w is None:
+                w = self._terms[term] = _TermWindow(self.size, len(self.spans), ow.head)
+            head = max(w.head, ow.head)
+            self._advance(w, head)
+            other._advance(ow, head)
+            w.ring = [a + b for a, b in zip(w.ring, ow.ring)]
+            w.sums = [a + b for a, b in zip(w.sums, ow.sums)]
+        if other.clock is not None and (self.clock is None or other.clock > self.clock):
+            self.clock = other.clock
+        if other.first is not None and (self.first is None or other.first < self.first):
+            self.first = other.first
+        return self
+
+    def stats(self, term: str) -> dict:
+        w = self._terms[term]
+        self._advance(w, self.clock)
+        r1, r24, r7d = (s / span for s, span in zip(w.sums, self.spans))
+        return {"1h": r1, "24h": r24, "7d": r7d, "velocity": r24 - r7d, "acceleration": r1 - r24}
+
+    def snapshot(self) -> dict[str, dict]:
+        return {term: self.stats(term) for term in self._terms}
+
+    def state(self) -> dict:
+        return {"bucket_seconds": self.bucket_seconds, "clock": self.clock, "first": self.first,
+                "terms": {term: [w.head, w.ring, w.sums] for term, w in self._terms.items()}}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "TrendVelocity":
+        velocity = cls(state["bucket_seconds"])
+        velocity.clock, velocity.first = state["clock"], state["first"]
+        for term, (head, ring, sums) in state["terms"].items():
+            w = velocity._terms[term] = _TermWindow(velocity.size, len(velocity.spans), head)
+            w.ring, w.sums = ring, sums
+        return velocity
+
+    def breakouts(self, k: int = 5) -> list[str]:
+        """Terms rising on both horizons, ranked by how far the last hour beats the weekly rate."""
+        rising = [(s["1h"] - s["7d"], term) for term, s in self.snapshot().items()
+                  if s["velocity"] > 0 and s["acceleration"] > 0]
+        return [term for _, term in sorted(rising, key=lambda x: -x[0])[:k]]
+
+
+def trend_report(scores: dict[str, int], posts_analyzed: int, velocity: Optional[TrendVelocity] = None) -> dict:
+    """The report dict; "rising" is only present once `velocity` is warm."""
+    sorted_trends = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+    saturday = datetime.now() + timedelta(days=(5 - datetime.now().weekday()) % 7 or 7)
+    report = {
+        "top_ingredients": [k for k, _ in sorted_trends[:5]],
+        "all_scores": dict(sorted_trends),
+        "total_posts_analyzed": posts_analyzed,
+        "analysis_date": datetime.now().strftime("%Y-%m-%d"),
+        "weekend": saturday.strftime("%B %d"),
+    }
+    if velocity is not None and velocity.warm:
+        report["rising"] = velocity.breakouts()
+    return report
+
+
+class TrendAccumulator:
+    """Running per-term like sums; feed posts one at a time and snapshot whenever.
+
+    With an `index`, every scored post is also recorded under its terms so
+    the posts behind a score can be looked up later. With a `velocity`
+    engine, matches also feed its windowed counters by post timestamp.
+    With a `sketch`, scores go to fixed-memory heavy-hitter counters instead
+    of the exact dict, and snapshots carry per-term and global error bounds.
+    """
+
+    __slots__ = ("matcher", "scores", "posts_seen", "index", "velocity", "sketch")
+
+    def __init__(self, matcher: TermMatcher = FOOD_MATCHER, index: Optional[TermIndex] = None,
+                 velocity: Optional[TrendVelocity] = None, sketch: Optional[HeavyHitters] = None):
+        self.matcher = matcher
+        self.scores: dict[str, int] = {}
+        self.posts_seen = 0
+        self.index = index
+        self.velocity = velocity
+        self.sketch = sketch
+
+    def add(self, post: Post) -> None:
+        likes = post.likes
+        terms = self.matcher.find(post.text.lower())
+        if self.sketch is None:
+            scores = self.scores
+            for term in terms:
+                scores[term] = scores.get(term, 0) + likes
+        else:
+            for term in terms:
+                self.sketch.add(term, likes)
+        if self.index is not None and terms:
+            self.index.add(post, terms)
+        if self.velocity is not None and terms:
+            ts = post_timestamp(post)
+            for term in terms:
+                self.velocity.add(term, likes, ts)
+        self.posts_seen += 1
+
+    def update(self, posts: Iterable[Post]) -> "TrendAccumulator":
+        for post in posts:
+            self.add(post)
+        return self
+
+    def merge(self, other: "TrendAccumulator") -> "TrendAccumulator":
+        """Add another accumulator's partial state, e.g. from a different shard of posts.
+
+        Merging is associative; term order for tied scores follows this
+        accumulator, then terms first seen in `other`. Indexes are not merged.
+        """
+        scores = self.scores
+        for term, likes in other.scores.items():
+            scores[term] = scores.get(term, 0) + likes
+        self.posts_seen += other.posts_seen
+        if self.velocity is not None and other.velocity is not None:
+            self.velocity.merge(other.velocity)
+        if self.sketch is not None and other.sketch is not None:
+            self.sketch.merge(other.sketch)
+        return self
+
+    def snapshot(self) -> dict:
+        if self.sketch is None:
+            return trend_report(self.scores, self.posts_seen, self.velocity)
+        report = trend_report(self.sketch.scores(), self.posts_seen, self.velocity)
+        report["score_bounds"] = self.sketch.bounds()
+        report["score_error"] = self.sketch.error_report()
+        return report
+
+
+def analyze_trends(posts: Iterable[Post], matcher: TermMatcher = FOOD_MATCHER,
+                   index: Optional[TermIndex] = None, sketch: Optional[HeavyHitters] = None,
+                   velocity: Optional[TrendVelocity] = None) -> dict:
+    return TrendAccumulator(matcher, index, velocity, sketch).update(posts).snapshot()
+
+
+def post_id(post: Post) -> str:
+    """Stable post identity: the source's own `id`, else a digest of platform, location, ts and text.
+
+    Without a source id, two posts with the same text from the same place
+    are only one post if they also carry the same timestamp.
+    """
+    if post.id is not None:
+        return str(post.id)
+    key = f"{post.platform}\x1f{post.location or ''}\x1f{post.ts}\x1f{post.text}"
+    return hashlib.blake2b(key.encode(), digest_size=12).hexdigest()
+
+
+class IncrementalAnalyzer:
+    """Term scores kept as durable state and refreshed from deltas.
+
+    New posts are matched once and remembered by `post_id` with their likes
+    and matched terms. A like-count change to a known post only adjusts that
+    post's terms, and `remove` takes a post back out. `snapshot()` gives the
+    same all_scores as analyze_trends over the posts held, at current likes;
+    after removals, terms tied on score may list in a different order.
+    Removals don't rewind `velocity`, which records likes as they were seen.
+    """
+
+    def __init__(self, matcher: TermMatcher = FOOD_MATCHER, velocity: Optional[TrendVelocity] = None):
+        self.matcher = matcher
+        self.velocity = velocity
+        self.scores: dict[str, int] = {}
+        self._counts: dict[str, int] = {}  # term -> held posts that match it
+        self._posts: dict[str, tuple[int, tuple[int, ...]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._posts)
+
+    def __contains__(self, pid: str) -> bool:
+        return pid in self._posts
+
+    def _credit(self, term_ids: tuple[int, ...], likes: int, ts: float) -> None:
+        terms, scores = self.matcher.terms, self.scores
+        for i in term_ids:
+            scores[terms[i]] = scores.get(terms[i], 0) + likes
+            if self.velocity is not None:
+                self.velocity.add(terms[i], likes, ts)
+
+    def add(self, post: Post, pid: Optional[str] = None) -> None:
+        pid = post_id(post) if pid is None else pid
+        if pid in self._posts:
+            self.update_likes(pid, post.likes)
+            return
+        term_ids = tuple(self.matcher.find_ids(post.text.lower()))
+        self._posts[pid] = (post.likes, term_ids)
+        if term_ids:
+            terms, counts = self.matcher.terms, self._counts
+            for i in term_ids:
+                counts[terms[i]] = counts.get(terms[i], 0) + 1
+            self._credit(term_ids, post.likes, post_timestamp(post))
+
+    def update_likes(self, pid: str, likes: int, ts: Optional[float] = None) -> None:
+        """Set a known post's like count; `ts` is when it was observed (default: now)."""
+        old, term_ids = self._posts[pid]
+        if likes != old:
+            self._posts[pid] = (likes, term_ids)
+            self._credit(term_ids, likes - old, time.time() if ts is None else ts)
+
+    def remove(self, pid: str) -> None:
+        likes, term_ids = self._posts.pop(pid)
+        terms, scores, counts = self.matcher.terms, self.scores, self._counts
+        for i in term_ids:
+            term = terms[i]
+            counts[term] -= 1
+            if counts[term]:
+                scores[term] -= likes
+            else:
+                del counts[term], scores[term]
+
+    def terms(self, pid: str) -> list[str]:
+        terms = self.matcher.terms
+        return [terms[i] for i in self._posts[pid][1]]
+
+    def apply(self, new_posts: Iterable[Post] = (), like_updates: Optional[Mapping[str, int]] = None,
+              ts: Optional[float] = None) -> "IncrementalAnalyzer":
+        """Fold in a delta: new (or re-scraped) posts plus like counts for known post IDs, observed at `ts`."""
+        for post in new_posts:
+            self.add(post)
+        for pid, likes in (like_updates or {}).items():
+            self.update_likes(pid, likes, ts)
+        return self
+
+    def sync(self, posts: Iterable[Post], index: Optional[TermIndex] = None,
+             ts: Optional[float] = None) -> "IncrementalAnalyzer":
+        """Make the held posts exactly `posts`, e.g. the latest scrape.
+
+        Only posts not held yet are matched; known ones take their current
+        likes and held posts missing from `posts` are removed. Posts sharing
+        an ID within `posts` are told apart by position. With an `index`,
+        every post in `posts` is recorded under its terms.
+        """
+        seen: set[str] = set()
+        for post in posts:
+            pid = post_id(post)
+            if pid in seen:
+                n = 1
+                while f"{pid}#{n}" in seen:
+                    n += 1
+                pid = f"{pid}#{n}"
+            seen.add(pid)
+            if pid in self._posts:
+                self.update_likes(pid, post.likes, ts)
+            else:
+                self.add(post, pid)
+            if index is not None and self._posts[pid][1]:
+                index.add(post, self.terms(pid))
+        for pid in [pid for pid in self._posts if pid not in seen]:
+            self.remove(pid)
+        return self
+
+    def snapshot(self) -> dict:
+        return trend_report(self.scores, len(self._posts), self.velocity)
+
+    def save(self, path: str) -> None:
+        state = {
+            "terms": self.matcher.terms,
+            "scores": list(self.scores.items()),
+            "posts": {pid: [likes, list(term_ids)] for pid, (likes, term_ids) in self._posts.items()},
+            "velocity": self.velocity.state() if self.velocity is not None else None,
+        }
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, matcher: TermMatcher = FOOD_MATCHER,
+             velocity: Optional[TrendVelocity] = None) -> "IncrementalAnalyzer":
+        """Restore saved state; a given `velocity` engine replaces the saved one."""
+        with open(path) as f:
+            state = json.load(f)
+        if state["terms"] != matcher.terms:
+            raise ValueError(f"{path} was built with a different term list; rebuild it with a full pass")
+        if velocity is None and state.get("velocity"):
+            velocity = TrendVelocity.from_state(state["velocity"])
+        analyzer = cls(matcher, velocity)
+        analyzer.scores = dict(state["scores"])
+        analyzer._posts = {pid: (likes, tuple(ids)) for pid, (likes, ids) in state["posts"].items()}
+        terms, counts = matcher.terms, analyzer._counts
+        for _, term_ids in analyzer._posts.values():
+            for i in term_ids:
+                counts[terms[i]] = counts.get(terms[i], 0) + 1
+        return analyzer